@@ -0,0 +1,633 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for dictate.py.
+
+  python benchmark_dictate.py startup             # guard CLI import cost
+  python benchmark_dictate.py pipeline            # stage timings, RTF, memory
+  python benchmark_dictate.py compare OLD NEW     # diff two pipeline results
+  python benchmark_dictate.py low-memory          # --low-memory size/accuracy trade-off
+  python benchmark_dictate.py segments            # guard parallel segment decoding against hangs
+
+Pipeline results are saved as JSON tagged with the git revision, so runs
+from different commits can be compared. Exits non-zero when a guard fails
+or a comparison finds a regression, so it can run in CI.
+"""
+import argparse
+import importlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from dictate import (
+    BACKENDS, MODEL_NAMES, WHISPER_SAMPLE_RATE, AudioBuffer, StageTimer, WhisperBackend,
+    _model_cache, configure_cpu, hardware_fingerprint, load_audio_file,
+    peak_rss_mb, prepare_audio, print_error, print_info, print_success,
+    record_inference, resolve_backend, save_audio, synthetic_speech,
+    transcribe_long, trim_silence, usable_cpus,
+)
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DICTATE = os.path.join(HERE, "dictate.py")
+RESULTS_DIR = os.path.join(HERE, "benchmark-results")
+
+# Must not be imported just to parse arguments
+HEAVY_MODULES = [
+    "numpy", "scipy", "sounddevice", "pyperclip", "torch", "whisper",
+    "faster_whisper", "ctranslate2", "pywhispercpp", "webrtcvad",
+]
+DEFAULT_STARTUP_BUDGET_MS = 300
+
+DEFAULT_LENGTHS = [5, 30, 120, 600, 1800]
+DEFAULT_MODELS = ["tiny", "base", "small", "medium"]
+# Frames per audio callback block when recording with latency='high'
+CAPTURE_BLOCK_FRAMES = 1024
+# Timed but not part of latency: recording happens while the user speaks,
+# and dictate.py only saves a WAV with --save-wav
+OFF_PATH_STAGES = {"record", "save"}
+DEFAULT_REGRESSION_PCT = 10
+LOW_MEMORY_SECONDS = 30
+SEGMENTS_SECONDS = 400
+DEFAULT_SEGMENTS_TIMEOUT_S = 900
+
+def imported_modules(argv):
+    """Top-level packages imported (and executed) while running dictate.py"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", DICTATE] + argv,
+        capture_output=True,
+        text=True
+    )
+    modules = set()
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            name = line.rsplit("|", 1)[1].strip()
+            modules.add(name.split(".")[0])
+    return modules
+
+def launch_times(command, runs):
+    """Wall-clock seconds for each of `runs` launches of command"""
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(command, capture_output=True)
+        times.append(time.perf_counter() - started)
+    return times
+
+def bench_startup(args):
+    """
+    Check that --help stays cheap.
+
+    Fails if any heavy dependency is imported, or if the median launch time
+    exceeds the budget. The module check is machine independent; the budget
+    catches regressions the module list doesn't name.
+    """
+    failed = False
+
+    heavy = sorted(set(HEAVY_MODULES) & imported_modules(["--help"]))
+    if heavy:
+        print_error(f"--help imports heavy modules: {', '.join(heavy)}")
+        failed = True
+    else:
+        print_success("--help imports no heavy modules")
+
+    # Interpreter start-up alone, to show dictate.py's own share
+    baseline = statistics.median(launch_times([sys.executable, "-c", "pass"], args.runs))
+    median = statistics.median(launch_times([sys.executable, DICTATE, "--help"], args.runs))
+    print_info(
+        f"dictate.py --help: median {median * 1000:.0f} ms over {args.runs} runs "
+        f"(interpreter alone {baseline * 1000:.0f} ms, budget {args.budget_ms} ms)"
+    )
+    if median * 1000 > args.budget_ms:
+        print_error("Startup time is over budget")
+        failed = True
+
+    return 1 if failed else 0
+
+def git_revision():
+    """(commit hash, uncommitted changes?) of this checkout, or (None, None)"""
+    try:
+        rev = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=HERE, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=HERE, capture_output=True, text=True, check=True
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return rev, bool(status.strip())
+
+def percentiles(values):
+    """Summary statistics of repeated measurements"""
+    import numpy as np
+    p50, p90, p99 = np.percentile(values, [50, 90, 99])
+    return {
+        "p50": round(float(p50), 4),
+        "p90": round(float(p90), 4),
+        "p99": round(float(p99), 4),
+        "mean": round(statistics.fmean(values), 4),
+        "min": round(min(values), 4),
+    }
+
+def audio_cases(lengths, fixtures):
+    """(name, mono float32 audio at 16 kHz) for each synthetic length and fixture file"""
+    for seconds in lengths:
+        yield f"synthetic-{seconds:g}s", synthetic_speech(seconds)
+    for path in fixtures:
+        yield os.path.basename(path), load_audio_file(path)
+
+def simulate_capture(audio):
+    """Feed audio through AudioBuffer in callback-sized blocks, as record_audio does"""
+    buffer = AudioBuffer(WHISPER_SAMPLE_RATE)
+    blocks = audio.reshape(-1, 1)
+    for start in range(0, len(blocks), CAPTURE_BLOCK_FRAMES):
+        buffer.write(blocks[start:start + CAPTURE_BLOCK_FRAMES])
+    return buffer.view()
+
+def bench_model(model_name, backend, lengths, fixtures, runs, vad, threads):
+    """
+    Time every audio case with one model.
+
+    Runs in its own process, so peak RSS covers this model only. Each run
+    goes through the stages of a dictation: capture (record_audio's
+    buffering, without a microphone), preprocess, save_audio (as with
+    --save-wav, so reported but left out of latency), then the same model
+    calls transcribe_audio makes.
+
+    Returns:
+        List of per-case result dicts
+    """
+    configure_cpu(threads)
+    started = time.perf_counter()
+    model = _model_cache.get(model_name, backend)
+    load_seconds = time.perf_counter() - started
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        wav_path = os.path.join(tmp, "benchmark.wav")
+        for name, audio in audio_cases(lengths, fixtures):
+            audio_seconds = len(audio) / WHISPER_SAMPLE_RATE
+            timers = []
+            for _ in range(runs):
+                timer = StageTimer()
+                with timer.stage("record"):
+                    captured = simulate_capture(audio)
+                with timer.stage("preprocess"):
+                    source = prepare_audio(captured, WHISPER_SAMPLE_RATE)
+                    if vad != "off":
+                        source, _, _ = trim_silence(source, WHISPER_SAMPLE_RATE, vad)
+                with timer.stage("save"):
+                    save_audio(source, WHISPER_SAMPLE_RATE, wav_path)
+                started = time.perf_counter()
+                result = model.transcribe(source)
+                record_inference(timer, result, time.perf_counter() - started)
+                timers.append(timer)
+
+            stages = {}
+            for timer in timers:
+                for stage, seconds in timer.stages.items():
+                    stages.setdefault(stage, []).append(seconds)
+            inference = [
+                sum(t.stages.get(s, 0.0) for s in StageTimer.INFERENCE_STAGES) for t in timers
+            ]
+            rss = peak_rss_mb()
+            results.append({
+                "model": model_name,
+                "case": name,
+                "audio_seconds": round(audio_seconds, 2),
+                "runs": runs,
+                "load_s": round(load_seconds, 3),
+                "stages": {stage: percentiles(values) for stage, values in stages.items()},
+                # Time the user waits after they stop speaking
+                "latency_s": percentiles(
+                    [sum(s for n, s in t.stages.items() if n not in OFF_PATH_STAGES) for t in timers]
+                ),
+                "rtf": percentiles([seconds / audio_seconds for seconds in inference]),
+                "peak_rss_mb": round(rss, 1) if rss is not None else None,
+            })
+            print_info(
+                f"{model_name:<7} {name:<20} latency p50 {results[-1]['latency_s']['p50']:.2f}s  "
+                f"RTF p50 {results[-1]['rtf']['p50']:.3f}  peak RSS {results[-1]['peak_rss_mb']} MB"
+            )
+    return results
+
+def bench_pipeline(args):
+    """Benchmark the pipeline for each model and save the results as JSON"""
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    try:
+        backend = resolve_backend(args.backend)
+    except RuntimeError as e:
+        print_error(str(e))
+        return 1
+
+    rev, dirty = git_revision()
+    report = {
+        "benchmark": "pipeline",
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_rev": rev,
+        "git_dirty": dirty,
+        "python": platform.python_version(),
+        "machine": hardware_fingerprint(backend),
+        "options": {
+            "runs": args.runs,
+            "vad": args.vad,
+            "threads": args.threads,
+            "lengths": args.lengths,
+            "fixtures": [os.path.basename(path) for path in args.fixtures],
+        },
+        "results": [],
+    }
+
+    failed = False
+    # A fresh process per model keeps peak RSS and thread settings separate
+    context = multiprocessing.get_context("spawn")
+    for model_name in args.models:
+        print_info(f"Benchmarking {model_name} ({backend}, {args.runs} runs per case)...")
+        try:
+            with ProcessPoolExecutor(1, mp_context=context) as pool:
+                report["results"] += pool.submit(
+                    bench_model, model_name, backend, args.lengths, args.fixtures,
+                    args.runs, args.vad, args.threads
+                ).result()
+        except Exception as e:
+            print_error(f"{model_name}: {e}")
+            failed = True
+
+    output = args.output
+    if output is None:
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = os.path.join(RESULTS_DIR, f"{stamp}-{(rev or 'norev')[:10]}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print_success(f"Results saved to {output}")
+    return 1 if failed else 0
+
+def bench_compare(args):
+    """Compare two pipeline results, failing on regressions over the threshold"""
+    reports = []
+    for path in (args.old, args.new):
+        with open(path, encoding="utf-8") as f:
+            reports.append(json.load(f))
+    old, new = ({(r["model"], r["case"]): r for r in report["results"]} for report in reports)
+
+    print_info(
+        f"{args.metric} p50: {(reports[0]['git_rev'] or '?')[:10]} -> {(reports[1]['git_rev'] or '?')[:10]}"
+    )
+    regressions = 0
+    for key in sorted(old.keys() & new.keys(), key=lambda k: (MODEL_NAMES.index(k[0]), k[1])):
+        before = old[key][args.metric]["p50"]
+        after = new[key][args.metric]["p50"]
+        change = 100 * (after - before) / before if before else 0.0
+        line = f"{key[0]:<7} {key[1]:<20} {before:>9.3f} -> {after:>9.3f}  {change:+6.1f}%"
+        if change > args.threshold:
+            regressions += 1
+            print_error(line)
+        else:
+            print(f"  {line}")
+    for key in sorted(old.keys() ^ new.keys()):
+        print_info(f"{key[0]} {key[1]}: only in {'old' if key in old else 'new'} results")
+
+    if regressions:
+        print_error(f"{regressions} cases regressed by more than {args.threshold:g}%")
+        return 1
+    print_success("No regressions")
+    return 0
+
+def word_error_rate(reference, hypothesis):
+    """Word edit distance between two transcripts, over the reference length"""
+    ref = reference.lower().split()
+    hyp = hypothesis.lower().split()
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    row = list(range(len(hyp) + 1))
+    for i, word in enumerate(ref, 1):
+        previous, row[0] = row[0], i
+        for j in range(1, len(hyp) + 1):
+            previous, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, previous + (word != hyp[j - 1]))
+    return row[-1] / len(ref)
+
+def resident_memory_mb():
+    """(anonymous, file-backed) resident MB from /proc, or (None, None)"""
+    found = {}
+    try:
+        with open("/proc/self/status", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith(("RssAnon:", "RssFile:")):
+                    name, value = line.split(":", 1)
+                    found[name] = int(value.split()[0]) / 2**10
+    except OSError:
+        pass
+    return found.get("RssAnon"), found.get("RssFile")
+
+def measure_model(model_name, backend, low_memory, audio, threads):
+    """Load and run one model in a fresh process (see bench_low_memory)"""
+    configure_cpu(threads)
+    WhisperBackend.low_memory = low_memory
+    # The engine's own imports aren't part of the model's footprint
+    importlib.import_module(BACKENDS[backend].module)
+    base_mb = peak_rss_mb()
+    started = time.perf_counter()
+    model = _model_cache.get(model_name, backend)
+    load_seconds = time.perf_counter() - started
+    load_mb = peak_rss_mb()
+    started = time.perf_counter()
+    result = model.transcribe(audio)
+    seconds = time.perf_counter() - started
+    anon, file_backed = resident_memory_mb()
+    return {
+        "load_s": round(load_seconds, 2),
+        "rtf": round(seconds / (len(audio) / WHISPER_SAMPLE_RATE), 4),
+        "load_rss_mb": load_mb - base_mb if base_mb is not None else None,
+        "peak_rss_mb": peak_rss_mb(),
+        "anon_mb": anon,
+        "file_mb": file_backed,
+        "size_mb": round(model.size_bytes() / 2**20),
+        "text": result["text"],
+    }
+
+def bench_low_memory(args):
+    """Compare full and --low-memory weights per model: memory, speed, accuracy"""
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    try:
+        backend = resolve_backend(args.backend)
+    except RuntimeError as e:
+        print_error(str(e))
+        return 1
+    if args.audio:
+        audio = load_audio_file(args.audio)
+    else:
+        audio = synthetic_speech(LOW_MEMORY_SECONDS)
+        print_info("No --audio given: synthetic audio shows memory and speed, but not accuracy")
+
+    def fmt(value, spec, width):
+        return (format(value, spec) if value is not None else "-").rjust(width)
+
+    context = multiprocessing.get_context("spawn")
+    rows = []
+    failed = False
+    print(f"  {'model':<8}{'weights':<9}{'load':>7}{'RTF':>8}{'load RSS':>10}{'peak RSS':>10}"
+          f"{'anon':>8}{'file':>8}{'size':>8}{'WER':>8}")
+    for model_name in args.models:
+        full = None
+        for low_memory in (False, True):
+            try:
+                # A fresh process each, so memory figures don't overlap
+                with ProcessPoolExecutor(1, mp_context=context) as pool:
+                    row = pool.submit(
+                        measure_model, model_name, backend, low_memory, audio, args.threads
+                    ).result()
+            except Exception as e:
+                print_error(f"{model_name} ({'low-memory' if low_memory else 'full'}): {e}")
+                failed = True
+                continue
+            row.update(model=model_name, weights="low" if low_memory else "full")
+            if low_memory and full is not None:
+                row["wer_vs_full"] = round(word_error_rate(full["text"], row["text"]), 4)
+            else:
+                full = row
+            rows.append(row)
+            print(
+                f"  {model_name:<8}{row['weights']:<9}{row['load_s']:>6.1f}s{row['rtf']:>8.3f}"
+                f"{fmt(row['load_rss_mb'], '.0f', 7)} MB{fmt(row['peak_rss_mb'], '.0f', 7)} MB{fmt(row['anon_mb'], '.0f', 8)}"
+                f"{fmt(row['file_mb'], '.0f', 8)}{row['size_mb']:>8}"
+                f"{fmt(row.get('wer_vs_full'), '.1%', 8)}"
+            )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"backend": backend, "audio": args.audio, "results": rows}, f, indent=2)
+        print_success(f"Results saved to {args.output}")
+    return 1 if failed else 0
+
+def run_segments(model_name, backend, seconds, workers):
+    """
+    Child process of bench_segments: decode in the parent on every core,
+    then hand long audio to transcribe_long's worker pool.
+
+    Using the engine's thread pool before the workers start is what made
+    forked workers deadlock, so this is the case the check has to cover.
+    """
+    configure_cpu(len(usable_cpus()))
+    audio = synthetic_speech(seconds)
+    _model_cache.get(model_name, backend).transcribe(audio[:WHISPER_SAMPLE_RATE * 5])
+    started = time.perf_counter()
+    result = transcribe_long(audio, model_name, backend, workers=workers)
+    print(json.dumps({
+        "seconds": round(time.perf_counter() - started, 2),
+        "segments": len(result["segments"]),
+    }))
+
+def bench_segments(args):
+    """Guard transcribe_long's worker pool against hanging after the parent used threads"""
+    import signal
+
+    try:
+        backend = resolve_backend(args.backend)
+    except RuntimeError as e:
+        print_error(str(e))
+        return 1
+    cpus = len(usable_cpus())
+    if cpus < 2:
+        print_info(f"Only {cpus} CPU usable: thread pool deadlocks may not show up here")
+
+    code = (
+        "from benchmark_dictate import run_segments; "
+        f"run_segments({args.model!r}, {backend!r}, {args.seconds!r}, {args.workers!r})"
+    )
+    print_info(f"Decoding {args.seconds}s with {args.workers} workers ({backend}, {args.model}, {cpus} CPUs)...")
+    # A session of its own, so a hung run can be killed along with its workers
+    child = subprocess.Popen(
+        [sys.executable, "-c", code], cwd=HERE, stdout=subprocess.PIPE, start_new_session=True
+    )
+    try:
+        out, _ = child.communicate(timeout=args.timeout)
+    except subprocess.TimeoutExpired:
+        os.killpg(child.pid, signal.SIGKILL)
+        child.wait()
+        print_error(f"Segment decoding hung: no result after {args.timeout}s")
+        return 1
+    if child.returncode != 0:
+        print_error(f"Segment decoding failed (exit code {child.returncode})")
+        return 1
+    result = json.loads(out.decode().strip().splitlines()[-1])
+    print_success(f"{result['segments']} segments decoded in {result['seconds']:.1f}s")
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks for dictate.py")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    startup = commands.add_parser("startup", help="Guard CLI start-up and import cost")
+    startup.add_argument(
+        "--runs",
+        type=int,
+        default=10,
+        help="Launches to time (default: 10)"
+    )
+    startup.add_argument(
+        "--budget-ms",
+        type=int,
+        default=DEFAULT_STARTUP_BUDGET_MS,
+        help=f"Maximum median start-up time in ms (default: {DEFAULT_STARTUP_BUDGET_MS})"
+    )
+    startup.set_defaults(run=bench_startup)
+
+    pipeline = commands.add_parser("pipeline", help="Time each pipeline stage per model and audio length")
+    pipeline.add_argument(
+        "--models",
+        nargs="+",
+        default=DEFAULT_MODELS,
+        choices=MODEL_NAMES,
+        help=f"Models to benchmark (default: {' '.join(DEFAULT_MODELS)})"
+    )
+    pipeline.add_argument(
+        "--lengths",
+        nargs="*",
+        type=float,
+        default=DEFAULT_LENGTHS,
+        help=f"Synthetic audio lengths in seconds (default: {' '.join(map(str, DEFAULT_LENGTHS))})"
+    )
+    pipeline.add_argument(
+        "--fixtures",
+        nargs="*",
+        default=[],
+        metavar="FILE",
+        help="Recorded audio files to benchmark as well"
+    )
+    pipeline.add_argument(
+        "-b", "--backend",
+        type=str,
+        default="auto",
+        help="Inference engine (default: auto)"
+    )
+    pipeline.add_argument(
+        "--runs",
+        type=int,
+        default=3,
+        help="Repetitions per model and audio case (default: 3)"
+    )
+    pipeline.add_argument(
+        "--vad",
+        type=str,
+        default="energy",
+        choices=["energy", "webrtc", "off"],
+        help="Silence trimming in the preprocess stage (default: energy)"
+    )
+    pipeline.add_argument(
+        "--threads",
+        type=int,
+        default=None,
+        help="CPU threads for inference (default: engine default)"
+    )
+    pipeline.add_argument(
+        "-o", "--output",
+        type=str,
+        default=None,
+        help="Results file (default: benchmark-results/<time>-<git rev>.json)"
+    )
+    pipeline.set_defaults(run=bench_pipeline)
+
+    compare = commands.add_parser("compare", help="Compare two pipeline results files")
+    compare.add_argument("old", help="Baseline results JSON")
+    compare.add_argument("new", help="Results JSON to check")
+    compare.add_argument(
+        "--metric",
+        type=str,
+        default="latency_s",
+        choices=["latency_s", "rtf"],
+        help="Metric to compare at p50 (default: latency_s)"
+    )
+    compare.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_REGRESSION_PCT,
+        help=f"Fail if any case is this many percent slower (default: {DEFAULT_REGRESSION_PCT})"
+    )
+    compare.set_defaults(run=bench_compare)
+
+    low_memory = commands.add_parser("low-memory", help="Memory/accuracy trade-off of --low-memory per model")
+    low_memory.add_argument(
+        "--models",
+        nargs="+",
+        default=MODEL_NAMES,
+        choices=MODEL_NAMES,
+        help="Models to compare (default: all)"
+    )
+    low_memory.add_argument(
+        "--audio",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help=f"Speech recording to transcribe (default: {LOW_MEMORY_SECONDS}s synthetic audio, no accuracy)"
+    )
+    low_memory.add_argument(
+        "-b", "--backend",
+        type=str,
+        default="auto",
+        help="Inference engine (default: auto)"
+    )
+    low_memory.add_argument(
+        "--threads",
+        type=int,
+        default=None,
+        help="CPU threads for inference (default: engine default)"
+    )
+    low_memory.add_argument(
+        "-o", "--output",
+        type=str,
+        default=None,
+        help="Also save the results as JSON"
+    )
+    low_memory.set_defaults(run=bench_low_memory)
+
+    segments = commands.add_parser(
+        "segments", help="Guard parallel segment decoding against hangs (run on a multi-core machine)"
+    )
+    segments.add_argument(
+        "-m", "--model",
+        type=str,
+        default="tiny",
+        choices=MODEL_NAMES,
+        help="Whisper model (default: tiny)"
+    )
+    segments.add_argument(
+        "-b", "--backend",
+        type=str,
+        default="openai",
+        help="Inference engine (default: openai, whose workers share one model)"
+    )
+    segments.add_argument(
+        "--seconds",
+        type=int,
+        default=SEGMENTS_SECONDS,
+        help=f"Length of synthetic audio to decode (default: {SEGMENTS_SECONDS})"
+    )
+    segments.add_argument(
+        "--workers",
+        type=int,
+        default=2,
+        help="Segment workers (default: 2)"
+    )
+    segments.add_argument(
+        "--timeout",
+        type=int,
+        default=DEFAULT_SEGMENTS_TIMEOUT_S,
+        help=f"Seconds before the run counts as hung (default: {DEFAULT_SEGMENTS_TIMEOUT_S})"
+    )
+    segments.set_defaults(run=bench_segments)
+
+    args = parser.parse_args()
+    sys.exit(args.run(args))
+
+if __name__ == "__main__":
+    main()
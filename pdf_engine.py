@@ -0,0 +1,660 @@
+#!/usr/bin/env python3
+"""
+Data-driven PDF document engine
+Renders structured content files (YAML or JSON) through a shared theme
+
+A content file names its theme, canvas class, page setup and output file,
+and lists its blocks in order:
+
+    theme: modern
+    canvas: create_preventli_pitch_deck:ModernPitchCanvas
+    output: Preventli_Pitch_Deck_Fixed.pdf
+    page: {size: A4, margins: {left: 0.8in, right: 0.8in, top: 1in, bottom: 1in}}
+    blocks:
+      - paragraph: Preventli
+        style: title
+      - bullets: [First point, Second point]
+      - table: [[Tier, Price], [Starter, From $299]]
+        widths: [3in, 2in]
+        style: [header, grid]
+      - spacer: 0.3in
+      - page_break
+
+Themes live in documents/themes/<name>.yaml and hold the colour palette,
+paragraph styles and named table styles. Styles are built once per theme
+and cached, so rendering many documents only pays for layout.
+
+build_document() skips documents whose PDF was already built from the
+same inputs, recorded in a .pdf-manifest.json next to the PDF.
+
+Content files with "section_cache: true" are rendered one section (the
+blocks between page breaks) at a time into cached PDF fragments keyed by
+the section's content, then merged with pypdf; the canvas class draws its
+page chrome over the merged pages. An edit re-renders only the sections it
+touches. This needs pypdf 4.3 or newer (pip install "pypdf>=4.3"), an
+optional dependency; without it the whole document is rendered in one
+pass as usual.
+
+Text may contain {name} placeholders; {date} is always available and
+further values come from the content file's "variables" or the caller.
+A block with "when: name" is only rendered if that variable is non-empty.
+"""
+
+import argparse
+import hashlib
+import importlib.metadata
+import inspect
+import json
+import os
+import re
+from datetime import datetime
+
+import reportlab
+from reportlab.lib import colors, pagesizes
+from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT, TA_JUSTIFY
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import toLength
+from reportlab.pdfgen import canvas
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Table, TableStyle
+
+DOCUMENTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "documents")
+THEMES_DIR = os.path.join(DOCUMENTS_DIR, "themes")
+
+ALIGNMENTS = {"left": TA_LEFT, "center": TA_CENTER, "right": TA_RIGHT, "justify": TA_JUSTIFY}
+COLOR_PROPERTIES = ("textColor", "backColor", "borderColor", "bulletColor")
+NAME_PROPERTIES = ("parent", "fontName", "bulletFontName")
+PLACEHOLDER = re.compile(r"\{(\w+)\}")
+MANIFEST_FILE = ".pdf-manifest.json"
+SECTION_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "pdf-engine", "sections")
+DEFAULT_SECTION_CACHE_MB = 64
+PYPDF_MIN_VERSION = (4, 3)
+
+_themes = {}
+_styles = {}
+
+def load_data(path):
+    """
+    Load a YAML or JSON file, chosen by extension.
+
+    Args:
+        path: File to read
+
+    Returns:
+        The parsed data
+    """
+    with open(path, encoding="utf-8") as f:
+        if path.endswith((".yaml", ".yml")):
+            import yaml
+            # libyaml's loader is several times faster when it is available
+            return yaml.load(f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+        return json.load(f)
+
+def theme_path(name):
+    """Return the file for a theme name, or name itself if it is a path."""
+    if os.path.exists(name):
+        return name
+    return os.path.join(THEMES_DIR, f"{name}.yaml")
+
+def load_theme(name):
+    """
+    Load a theme by name, reusing it if already loaded.
+
+    Args:
+        name: Theme name under documents/themes, or a path
+
+    Returns:
+        dict: The theme data
+    """
+    path = theme_path(name)
+    if path not in _themes:
+        _themes[path] = load_data(path)
+    return _themes[path]
+
+def to_length(value):
+    """Convert a number of points or a unit string such as "0.8in" to points."""
+    if isinstance(value, str):
+        return toLength(value)
+    return value
+
+def resolve_color(value, palette):
+    """
+    Resolve a palette name, "#RRGGBB" string or ReportLab colour name.
+
+    Args:
+        value: Colour reference
+        palette: Theme colours, name -> hex string
+
+    Returns:
+        Color, or None if value is not a colour reference
+    """
+    if not isinstance(value, str):
+        return None
+    if value in palette:
+        return colors.HexColor(palette[value])
+    if value.startswith("#"):
+        return colors.HexColor(value)
+    color = getattr(colors, value, None)
+    return color if isinstance(color, colors.Color) else None
+
+def build_styles(theme):
+    """
+    Build the ParagraphStyles a theme defines.
+
+    A style's parent may be an earlier style in the same theme or one of
+    ReportLab's sample styles (Title, Normal, Heading1, ...).
+
+    Args:
+        theme: Theme data
+
+    Returns:
+        dict: Style name -> ParagraphStyle
+    """
+    sample = getSampleStyleSheet()
+    palette = theme.get("colors", {})
+    styles = {}
+    for name, spec in theme.get("styles", {}).items():
+        kwargs = {}
+        for key, value in spec.items():
+            if key == "parent":
+                value = styles[value] if value in styles else sample[value]
+            elif key in COLOR_PROPERTIES:
+                value = resolve_color(value, palette)
+            elif key == "alignment":
+                value = ALIGNMENTS[value]
+            elif key not in NAME_PROPERTIES:
+                value = to_length(value)
+            kwargs[key] = value
+        styles[name] = ParagraphStyle(name, **kwargs)
+    return styles
+
+def get_styles(theme_name):
+    """Return the cached styles for a theme, building them on first use."""
+    path = theme_path(theme_name)
+    if path not in _styles:
+        _styles[path] = build_styles(load_theme(theme_name))
+    return _styles[path]
+
+def table_command(command, palette):
+    """Convert one theme table command, resolving colour names in its arguments."""
+    name, start, end, *args = command
+    resolved = []
+    for arg in args:
+        if isinstance(arg, list):
+            resolved.append([resolve_color(a, palette) or a for a in arg])
+        else:
+            resolved.append(resolve_color(arg, palette) or arg)
+    return (name, tuple(start), tuple(end), *resolved)
+
+def substitute(text, variables):
+    """Replace {name} placeholders that have a value in variables."""
+    return PLACEHOLDER.sub(lambda m: str(variables.get(m.group(1), m.group(0))), text)
+
+class RenderContext:
+    """Theme, styles and variables shared by the block renderers of one document"""
+
+    def __init__(self, theme_name, variables):
+        self.theme = load_theme(theme_name)
+        self.styles = get_styles(theme_name)
+        self.palette = self.theme.get("colors", {})
+        self.defaults = self.theme.get("defaults", {})
+        self.variables = variables
+
+    def style(self, block, default):
+        """Look up the block's paragraph style, falling back to a theme default."""
+        return self.styles[block.get("style", self.defaults.get(default, "body"))]
+
+    def text(self, text):
+        return substitute(str(text), self.variables)
+
+def render_paragraph(block, context):
+    """A paragraph in the block's style (theme default: defaults.paragraph)."""
+    return [Paragraph(context.text(block["paragraph"]), context.style(block, "paragraph"))]
+
+def render_bullets(block, context):
+    """One paragraph per item, prefixed with the theme's bullet marker."""
+    style = context.style(block, "bullets")
+    marker = block.get("marker", context.defaults.get("bullet_marker", "• "))
+    return [Paragraph(marker + context.text(item), style) for item in block["bullets"]]
+
+def render_table(block, context):
+    """A table styled by named theme table styles plus the block's own commands."""
+    rows = [[context.text(cell) for cell in row] for row in block["table"]]
+    widths = [to_length(w) for w in block["widths"]] if "widths" in block else None
+    style_names = block.get("style", [])
+    if isinstance(style_names, str):
+        style_names = [style_names]
+    commands = []
+    for name in style_names:
+        commands.extend(context.theme["tables"][name])
+    commands.extend(block.get("commands", []))
+    table = Table(rows, colWidths=widths)
+    table.setStyle(TableStyle([table_command(c, context.palette) for c in commands]))
+    return [table]
+
+def render_spacer(block, context):
+    """Vertical space of the given length."""
+    return [Spacer(1, to_length(block["spacer"]))]
+
+def render_page_break(block, context):
+    """Start a new page."""
+    return [PageBreak()]
+
+BLOCK_RENDERERS = {
+    "paragraph": render_paragraph,
+    "bullets": render_bullets,
+    "table": render_table,
+    "spacer": render_spacer,
+    "page_break": render_page_break,
+}
+
+def block_type(block):
+    """Return the renderer key for a block; a bare string names a type with no options."""
+    if isinstance(block, str):
+        key = block
+    else:
+        key = next((k for k in block if k in BLOCK_RENDERERS), None)
+    if key not in BLOCK_RENDERERS:
+        raise ValueError(f"Unknown block: {block!r}")
+    return key
+
+def build_story(blocks, context):
+    """
+    Render content blocks to ReportLab flowables.
+
+    Args:
+        blocks: Block list from a content file
+        context: RenderContext for the document
+
+    Returns:
+        list: Flowables in document order
+    """
+    story = []
+    for block in blocks:
+        key = block_type(block)
+        if isinstance(block, dict) and "when" in block and not context.variables.get(block["when"]):
+            continue
+        story.extend(BLOCK_RENDERERS[key](block if isinstance(block, dict) else {}, context))
+    return story
+
+def resolve_canvas(spec):
+    """
+    Resolve a "module:Class" canvas reference.
+
+    Args:
+        spec: Reference such as "create_ai_predictions_pdf:NumberedCanvas", or None
+
+    Returns:
+        The canvas class (ReportLab's plain Canvas if spec is empty)
+    """
+    if not spec:
+        return canvas.Canvas
+    module_name, _, class_name = spec.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
+def content_path(name):
+    """Return the file for a document name under documents/, or name itself if it is a path."""
+    if os.path.exists(name):
+        return name
+    return os.path.join(DOCUMENTS_DIR, f"{name}.yaml")
+
+def document_variables(content, variables=None):
+    """Merge the built-in, content-file and caller variables, later ones winning."""
+    merged = {"date": datetime.now().strftime('%B %Y')}
+    merged.update(content.get("variables") or {})
+    merged.update(variables or {})
+    return merged
+
+def page_setup(content):
+    """Return SimpleDocTemplate keyword arguments for a content file's page size and margins."""
+    page = content.get("page", {})
+    setup = {f"{side}Margin": to_length(value)
+             for side, value in page.get("margins", {}).items()}
+    setup["pagesize"] = getattr(pagesizes, page.get("size", "A4"))
+    return setup
+
+def split_sections(blocks):
+    """Split a block list at its page breaks, dropping the breaks and empty sections."""
+    sections = [[]]
+    for block in blocks:
+        if block_type(block) == "page_break":
+            sections.append([])
+        else:
+            sections[-1].append(block)
+    return [section for section in sections if section]
+
+class SectionCache:
+    """
+    On-disk PDF fragments of document sections, keyed by content hash.
+
+    The key covers the section's blocks, the variables they use, the theme
+    file, the page setup, this engine's source and the ReportLab version,
+    so a hit is exactly what rendering the section would produce. Fragments
+    carry no page chrome, so the canvas class is not part of the key. Reading
+    an entry refreshes its mtime, and the least recently used entries are
+    deleted once the directory exceeds max_bytes. hits and misses count
+    lookups made through this instance.
+    """
+
+    def __init__(self, directory=SECTION_CACHE_DIR, max_bytes=DEFAULT_SECTION_CACHE_MB * 2**20):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def base_digest(self, content):
+        """Hash of the inputs shared by every section of a document"""
+        digest = hashlib.sha256()
+        for source in (theme_path(content["theme"]), __file__):
+            with open(source, "rb") as f:
+                digest.update(f.read())
+        digest.update(json.dumps(content.get("page", {}), sort_keys=True).encode())
+        digest.update(reportlab.Version.encode())
+        return digest
+
+    def key(self, base, section, variables):
+        digest = base.copy()
+        text = json.dumps(section, sort_keys=True)
+        # Only the variables a section uses, so e.g. a customer name on the
+        # title slide doesn't invalidate every other slide
+        used = set(PLACEHOLDER.findall(text))
+        used.update(block["when"] for block in section if isinstance(block, dict) and "when" in block)
+        digest.update(text.encode())
+        digest.update(json.dumps({k: str(variables.get(k, "")) for k in sorted(used)}).encode())
+        return digest.hexdigest()
+
+    def chrome_key(self, canvas_class, page_count, pagesize):
+        """Key for the page chrome a canvas class draws on a document of page_count pages"""
+        digest = hashlib.sha256(inspect.getsource(canvas_class).encode())
+        digest.update(json.dumps([page_count, list(pagesize), reportlab.Version]).encode())
+        return "chrome-" + digest.hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key + ".pdf")
+
+    def get(self, key):
+        """Path of the cached fragment, or None"""
+        path = self.path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return path
+
+    def put(self, key, render):
+        """
+        Render a fragment into the cache.
+
+        Args:
+            key: Section key
+            render: Function writing the fragment PDF to the path it is given
+
+        Returns:
+            str: Path of the cached fragment
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        temp_path = self.path(key) + f".{os.getpid()}.tmp"
+        render(temp_path)
+        os.replace(temp_path, self.path(key))
+        return self.path(key)
+
+    def evict(self):
+        if not os.path.isdir(self.directory):
+            return
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".pdf"):
+                stat = entry.stat()
+                entries.append((entry.path, stat.st_size, stat.st_mtime))
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in sorted(entries, key=lambda e: e[2]):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass  # Evicted concurrently by another process
+            total -= size
+
+def draw_chrome(canvas_class, page_count, pagesize, filename):
+    """
+    Draw a canvas class's page chrome on blank pages.
+
+    Canvas classes add numbering, footers and the like in showPage() or
+    save(), so showing page_count empty pages yields exactly the chrome
+    each page of a document that long would get.
+
+    Args:
+        canvas_class: Canvas class of the document
+        page_count: Pages in the document
+        pagesize: Page size of the document
+        filename: PDF to write, one chrome page per document page
+    """
+    chrome = canvas_class(filename, pagesize=pagesize)
+    for _ in range(page_count):
+        chrome.showPage()
+    chrome.save()
+
+def stamp_pages(writer, pages, overlays):
+    """
+    Draw each overlay page on top of the matching page, then share what the
+    fragments duplicate.
+
+    Every fragment is a complete PDF with its own font and resource objects,
+    so identical objects are merged before writing; without that the merged
+    document is over half as large again as one rendered in one pass.
+
+    Args:
+        writer: PdfWriter holding pages
+        pages: Pages to draw over
+        overlays: Overlay pages, one per page
+    """
+    for page, overlay in zip(pages, overlays):
+        page.merge_page(overlay)
+        page.compress_content_streams()
+    writer.compress_identical_objects()
+
+def can_merge_sections():
+    """True if pypdf is installed and new enough to merge section fragments"""
+    try:
+        version = importlib.metadata.version("pypdf")
+    except importlib.metadata.PackageNotFoundError:
+        return False
+    return tuple(int(part) for part in re.findall(r"\d+", version)[:2]) >= PYPDF_MIN_VERSION
+
+def render_sections(content, context, output, cache):
+    """
+    Render a document from cached section fragments.
+
+    Args:
+        content: Content file data
+        context: RenderContext for the document
+        output: PDF path
+        cache: SectionCache to read and fill
+    """
+    from pypdf import PdfReader, PdfWriter
+
+    setup = page_setup(content)
+    base = cache.base_digest(content)
+    writer = PdfWriter()
+    for section in split_sections(content["blocks"]):
+        key = cache.key(base, section, context.variables)
+        path = cache.get(key)
+        if path is None:
+            def render(temp_path, section=section):
+                SimpleDocTemplate(temp_path, **setup).build(build_story(section, context))
+            path = cache.put(key, render)
+        for page in PdfReader(path).pages:
+            writer.add_page(page)
+
+    pages = list(writer.pages)
+    canvas_class = resolve_canvas(content.get("canvas"))
+    # The chrome only depends on the page count, so it is cached as well
+    key = cache.chrome_key(canvas_class, len(pages), setup["pagesize"])
+    chrome = cache.path(key)
+    if not os.path.exists(chrome):
+        chrome = cache.put(key, lambda path: draw_chrome(canvas_class, len(pages), setup["pagesize"], path))
+    stamp_pages(writer, pages, PdfReader(chrome).pages)
+    with open(output, "wb") as f:
+        writer.write(f)
+    cache.evict()
+
+def render_document(name, output=None, variables=None, section_cache=None):
+    """
+    Render a content file to PDF.
+
+    Args:
+        name: Document name under documents/, or a content file path
+        output: PDF path (default: the content file's "output")
+        variables: Extra placeholder values, overriding the content file's
+        section_cache: SectionCache to render through, False to render in one
+            pass, or None to follow the content file's "section_cache" setting.
+            Without pypdf 4.3 or newer the document is always rendered in
+            one pass.
+
+    Returns:
+        str: The PDF path written
+    """
+    content = load_data(content_path(name))
+    output = output or content["output"]
+    context = RenderContext(content["theme"], document_variables(content, variables))
+
+    if section_cache is None and content.get("section_cache"):
+        section_cache = SectionCache()
+    if section_cache and can_merge_sections():
+        render_sections(content, context, output, section_cache)
+        return output
+
+    doc = SimpleDocTemplate(output, **page_setup(content))
+    story = build_story(content["blocks"], context)
+    doc.build(story, canvasmaker=resolve_canvas(content.get("canvas")))
+    return output
+
+def input_digest(name, variables=None):
+    """
+    Hash everything a document's PDF is rendered from.
+
+    Covers the content file, its theme, the canvas class source, the
+    resolved variables, this engine's source and the ReportLab version.
+
+    Args:
+        name: Document name under documents/, or a content file path
+        variables: Extra placeholder values, as for render_document()
+
+    Returns:
+        str: Hex digest
+    """
+    path = content_path(name)
+    content = load_data(path)
+    digest = hashlib.sha256()
+    for source in (path, theme_path(content["theme"]), __file__):
+        with open(source, "rb") as f:
+            digest.update(f.read())
+    digest.update(inspect.getsource(resolve_canvas(content.get("canvas"))).encode())
+    digest.update(json.dumps(document_variables(content, variables), sort_keys=True).encode())
+    digest.update(reportlab.Version.encode())
+    return digest.hexdigest()
+
+class BuildManifest:
+    """
+    Input digests of built PDFs, stored as JSON in their directory.
+
+    A PDF is current if it still exists and its recorded digest matches
+    the digest of its inputs now.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory or "."
+        self.path = os.path.join(self.directory, MANIFEST_FILE)
+        self.entries = {}
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                self.entries = json.load(f)
+
+    def _key(self, output):
+        return os.path.relpath(output, self.directory)
+
+    def is_current(self, output, digest):
+        return self.entries.get(self._key(output)) == digest and os.path.exists(output)
+
+    def record(self, output, digest):
+        self.entries[self._key(output)] = digest
+        self.save()
+
+    def save(self):
+        # Write then rename, so an interrupted run never leaves a torn file
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=2, sort_keys=True)
+        os.replace(temp_path, self.path)
+
+def build_document(name, output=None, variables=None, force=False, section_cache=None):
+    """
+    Render a content file unless its PDF is already current.
+
+    Args:
+        name: Document name under documents/, or a content file path
+        output: PDF path (default: the content file's "output")
+        variables: Extra placeholder values, overriding the content file's
+        force: Render even if the inputs are unchanged
+        section_cache: As for render_document()
+
+    Returns:
+        tuple: (PDF path, True if it was rendered or False if skipped)
+    """
+    output = output or load_data(content_path(name))["output"]
+    digest = input_digest(name, variables)
+    manifest = BuildManifest(os.path.dirname(output))
+    if not force and manifest.is_current(output, digest):
+        return output, False
+    render_document(name, output=output, variables=variables, section_cache=section_cache)
+    manifest.record(output, digest)
+    return output, True
+
+def main():
+    parser = argparse.ArgumentParser(description="Render a YAML/JSON content file to PDF")
+    parser.add_argument(
+        "document",
+        help="Document name under documents/ or path to a content file"
+    )
+    parser.add_argument(
+        "--output", "-o",
+        help="Output PDF path (default: the content file's output)"
+    )
+    parser.add_argument(
+        "--set",
+        action="append",
+        default=[],
+        metavar="NAME=VALUE",
+        help="Set a {NAME} placeholder value (repeatable)"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rebuild even if the content, theme, canvas and ReportLab are unchanged"
+    )
+    parser.add_argument(
+        "--no-section-cache",
+        action="store_true",
+        help="Render in one pass even if the content file enables section_cache"
+    )
+    args = parser.parse_args()
+
+    variables = {}
+    for item in args.set:
+        name, sep, value = item.partition("=")
+        if not sep:
+            parser.error(f"--set expects NAME=VALUE, got {item!r}")
+        variables[name] = value
+    filename, built = build_document(args.document, output=args.output, variables=variables,
+                                     force=args.force,
+                                     section_cache=False if args.no_section_cache else None)
+    if not built:
+        print(f"Up to date: {filename} (use --force to rebuild)")
+        return
+    print(f"PDF generated successfully: {filename}")
+    print(f"File size: {os.path.getsize(filename)} bytes")
+
+if __name__ == "__main__":
+    main()